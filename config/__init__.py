@@ -1,8 +1,11 @@
 """
 配置模块
 管理全局配置和提示词模板
+
+全局配置实例通过 get_settings() 或 `from config.settings import settings` 获取（首次访问时构建），
+config.settings 始终是子模块本身
 """
 
-from .settings import settings
+from .settings import get_settings
 
-__all__ = ['settings'] 
\ No newline at end of file
+__all__ = ['get_settings']
@@ -1,18 +1,34 @@
 """
 提示词模板模块
 管理各个功能模块的提示词模板
+各模板类在首次访问时才导入对应子模块（PEP 562）
 """
 
-from .scenario_prompts import ScenarioPrompts
-from .tool_prompts import ToolPrompts
-from .agent_prompts import AgentPrompts
-from .task_prompts import TaskPrompts
-# from .evaluation_prompts import EvaluationPrompts
-
-__all__ = [
-    'ScenarioPrompts',
-    'ToolPrompts',
-    'AgentPrompts', 
-    'TaskPrompts',
-    # 'EvaluationPrompts'
-]
\ No newline at end of file
+import importlib
+
+from ._tools import format_tool_set, format_tools
+
+_LAZY = {
+    'ScenarioPrompts': 'scenario_prompts',
+    'ToolPrompts': 'tool_prompts',
+    'AgentPrompts': 'agent_prompts',
+    'TaskPrompts': 'task_prompts',
+    'EvaluationPrompts': 'evaluation_prompts',
+    'ExecutionPrompts': 'execution_prompts',
+    'UserPrompts': 'user_prompts',
+}
+
+__all__ = list(_LAZY) + ['format_tools', 'format_tool_set']
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module("." + _LAZY[name], __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
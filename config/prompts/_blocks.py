@@ -0,0 +1,21 @@
+"""
+提示词内容块工具
+将静态提示词前缀与动态尾部拆分为独立的内容块，便于命中服务端prompt cache
+"""
+
+from typing import Any, Dict, List
+
+
+def cache_block(text: str) -> Dict[str, Any]:
+    """构建带ephemeral缓存标记的静态内容块"""
+    return {"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}
+
+
+def text_block(text: str) -> Dict[str, Any]:
+    """构建不缓存的动态内容块"""
+    return {"type": "text", "text": text}
+
+
+def join_blocks(blocks: List[Dict[str, Any]]) -> str:
+    """将内容块拼接为纯文本（用于不支持内容块的提供商或需要持久化的场景）"""
+    return "".join(block["text"] for block in blocks)
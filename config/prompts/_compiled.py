@@ -0,0 +1,165 @@
+"""
+提示词模板预编译工具
+在导入时将模板解析为 (literal, field_name) 片段列表，渲染时直接拼接，避免每次调用 str.format 重新解析
+
+占位符使用 <<field_name>> 形式，模板中的 JSON 示例可以直接书写 { }，无需转义
+"""
+
+import functools
+import hashlib
+import importlib.resources
+import json
+import re
+from typing import Any, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+ParsedTemplate = List[Tuple[str, Optional[str]]]
+
+_PLACEHOLDER = re.compile(r"<<\s*([A-Za-z_][A-Za-z0-9_]*)\s*>>")
+
+_TEMPLATES_PACKAGE = __package__ + ".templates"
+
+
+def minify_json(pretty: str) -> str:
+    """将格式化的JSON示例压缩为单行，去掉无信息量的缩进和换行"""
+    return json.dumps(json.loads(pretty), ensure_ascii=False, separators=(",", ":"))
+
+
+def compile_template(template: str, **constants: Any) -> ParsedTemplate:
+    """
+    将模板字符串解析为片段列表（只在模块加载时调用一次）
+
+    Args:
+        template: 模板字符串
+        **constants: 编译期即可确定的字段，直接折叠进字面量
+    """
+    parsed = []
+    pending = ""
+    pos = 0
+    for match in _PLACEHOLDER.finditer(template):
+        pending += template[pos:match.start()]
+        pos = match.end()
+        field = match.group(1)
+        if field in constants:
+            pending += str(constants[field])
+            continue
+        parsed.append((pending, field))
+        pending = ""
+    pending += template[pos:]
+    if pending:
+        parsed.append((pending, None))
+    return parsed
+
+
+@functools.lru_cache(maxsize=None)
+def load_text(name: str) -> str:
+    """读取 templates 目录下的模板文件（每个文件只读取一次）"""
+    return importlib.resources.files(_TEMPLATES_PACKAGE).joinpath(name).read_text(encoding="utf-8")
+
+
+def load_template(name: str, **constants: Any) -> ParsedTemplate:
+    """读取并预编译模板文件，缓存的是解析后的片段列表而非原始字符串"""
+    return _load_template(name, tuple(sorted(constants.items())))
+
+
+@functools.lru_cache(maxsize=None)
+def _load_template(name: str, constants: Tuple[Tuple[str, Any], ...]) -> ParsedTemplate:
+    return compile_template(load_text(name), **dict(constants))
+
+
+def render(parsed: ParsedTemplate, **kwargs: Any) -> str:
+    """按预解析的片段列表渲染模板"""
+    return "".join(
+        literal + (str(kwargs[field]) if field is not None else "")
+        for literal, field in parsed
+    )
+
+
+def split_template(parsed: ParsedTemplate, field: str) -> Tuple[str, str]:
+    """
+    将只含单个占位符的模板拆成 (前缀, 后缀)，渲染退化为两次字符串拼接
+
+    Args:
+        parsed: 预解析的片段列表
+        field: 唯一的占位符名
+    """
+    fields = [name for _, name in parsed if name is not None]
+    if fields != [field]:
+        raise ValueError(f"Template must contain exactly one placeholder <<{field}>>, got {fields}")
+    prefix = parsed[0][0]
+    suffix = parsed[1][0] if len(parsed) > 1 else ""
+    return prefix, suffix
+
+
+def render_many(parsed: ParsedTemplate, kwargs_iter: Iterable[Mapping[str, Any]]) -> Iterator[str]:
+    """
+    批量渲染同一模板，逐个产出结果（不构建中间列表）
+
+    Args:
+        parsed: 预解析的片段列表
+        kwargs_iter: 每次渲染所用参数字典的可迭代对象
+    """
+    pieces = tuple(parsed)
+    for kwargs in kwargs_iter:
+        yield "".join(
+            literal + (str(kwargs[field]) if field is not None else "")
+            for literal, field in pieces
+        )
+
+
+def _canon(value: Any) -> str:
+    """规范化参数值，保证字典键顺序不同的等价参数得到相同的序列化结果"""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def template_key(template_id: str, template: Any = None, **kwargs: Any) -> str:
+    """
+    计算 (模板, 参数) 的稳定哈希，用作LLM响应缓存的键
+
+    Args:
+        template_id: 模板标识
+        template: 模板内容，参与哈希使模板修改后旧缓存自动失效
+        **kwargs: 渲染参数
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(template_id.encode())
+    if template is not None:
+        h.update(b"\x02")
+        h.update(repr(template).encode())
+    for k in sorted(kwargs):
+        h.update(b"\x00")
+        h.update(k.encode())
+        h.update(b"\x01")
+        h.update(_canon(kwargs[k]).encode())
+    return h.hexdigest()
+
+
+class PromptTemplates:
+    """提示词类基类，提供模板哈希接口（模板均为类属性，实例不需要 __dict__）"""
+
+    __slots__ = ()
+
+    @classmethod
+    def key(cls, template_name: str, **kwargs: Any) -> str:
+        """
+        返回模板与参数的哈希键，调用方可据此缓存LLM响应
+
+        Args:
+            template_name: 类属性中的模板名，如 "TOOL_VALIDATION"
+            **kwargs: 渲染该模板所用的参数
+        """
+        return template_key(
+            f"{cls.__name__}.{template_name}",
+            getattr(cls, template_name, None),
+            **kwargs,
+        )
+
+    @classmethod
+    def render_many(cls, template_name: str, kwargs_iter: Iterable[Mapping[str, Any]]) -> Iterator[str]:
+        """
+        按参数序列批量渲染类中的预编译模板，返回生成器
+
+        Args:
+            template_name: 类属性中的模板名，如 "TOOL_VALIDATION"
+            kwargs_iter: 每次渲染所用参数字典的可迭代对象
+        """
+        return render_many(getattr(cls, template_name), kwargs_iter)
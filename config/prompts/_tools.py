@@ -0,0 +1,34 @@
+"""
+工具列表序列化工具
+提示词中的工具信息统一用键排序、无空白的JSON表示，保证同一组工具每次得到完全相同的字节序列，
+避免字典插入顺序不同导致响应缓存和服务端prompt cache失效
+"""
+
+import json
+from typing import Any, Dict, List
+
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时回退到标准库 json
+    orjson = None
+
+
+def format_tools(tools: Any) -> str:
+    """将工具信息序列化为稳定的紧凑JSON（键排序、无多余空白）"""
+    if orjson is not None:
+        return orjson.dumps(tools, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(tools, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def _tool_key(tool: Dict[str, Any]) -> str:
+    return str(tool.get("id") or tool.get("name", ""))
+
+
+def format_tool_set(tools: List[Dict[str, Any]]) -> str:
+    """
+    序列化一组工具，工具按 id（缺省时为 name）排序，同一工具集与传入顺序无关地得到相同结果
+
+    Args:
+        tools: 工具字典列表
+    """
+    return format_tools(sorted(tools, key=_tool_key))
@@ -2,9 +2,16 @@
 智能体生成相关的提示词模板
 """
 
+from typing import Any, Dict, List
 
-class AgentPrompts:
+from ._blocks import cache_block, text_block
+from ._compiled import PromptTemplates, load_template, load_text, render, split_template
+
+
+class AgentPrompts(PromptTemplates):
     """智能体相关提示词模板"""
+
+    __slots__ = ()
     
 #     AGENT_SYSTEM = """你现在扮演AI系统角色 **system**，负责根据当前对话历史及API接口说明，生成下一步的响应内容。你的任务是：
 
@@ -51,49 +58,33 @@ class AgentPrompts:
 # {tools_list}""" # noqa: E501
 
 
-    AGENT_SYSTEM = """
-You are the AI system with the role name **system**. Based on the current conversation history and the provided API specifications, generate the next response.  
-
-**Your tasks:**  
-
-1. **Making API Calls**  
-   - If the conversation history provides complete and sufficient information to make an API call, generate the API request using the latest step’s data.  
-   - Include only parameters explicitly provided by the user. Optional parameters should not be filled unless specified.  
-   - API request format must strictly follow the function call format:  
-     ```json
-     {{
-       "name": "function_name",
-       "arguments": {{
-         "key1": "value1",
-         "key2": "value2"
-       }}
-     }}
-     ```
-
-2. **Requesting Information from the User**  
-   - If the provided information is incomplete and does not allow for a valid API call, ask the user a **clear and concise question** to collect the missing details.  
-   - Do **not** infer or guess missing information.  
-   - When asking the user for information, **do not** include an API call in the same response.  
-
-3. **Rules & Constraints**  
-   - Do not provide any unauthorized or unpermitted information, knowledge, or code, and do not give personal opinions or suggestions.  
-
-***
-
-**Role Definitions:**  
-- **user**: The system user who provides requests and parameter information.  
-- **agent**: The AI system that parses information and generates API calls or asks for missing details.  
-- **execution**: Executes the API call and returns the result.  
-
-**Available APIs:**
-
-{tools_list}
-
-"""
-
-    AGENT_USER = """
-Conversation history:
-{conversation_history}
-
-Please generate the next response based on the conversation history.
-"""
\ No newline at end of file
+    # 静态系统提示词前缀（可缓存）
+    AGENT_SYSTEM_HEADER = load_text("agent_system_header.md")
+
+    # 动态工具列表尾部
+    AGENT_SYSTEM_TOOLS = load_template("agent_system_tools.md")
+    AGENT_USER = load_template("agent_user.md")
+    # AGENT_USER 每轮都要渲染且只有一个占位符，预先拆成前后缀直接拼接
+    _AGENT_USER_PREFIX, _AGENT_USER_SUFFIX = split_template(AGENT_USER, "conversation_history")
+
+    @classmethod
+    def build_agent_system(cls, tools_list: str) -> List[Dict[str, Any]]:
+        """
+        构建智能体系统提示词内容块：静态规则在前并缓存，工具列表在后
+
+        tools_list 应由 format_tools() 序列化，保证同一工具集的字节序列稳定
+        """
+        return [
+            cache_block(cls.AGENT_SYSTEM_HEADER),
+            text_block(cls.agent_system_tools(tools_list=tools_list)),
+        ]
+
+    @classmethod
+    def agent_system_tools(cls, **kwargs) -> str:
+        """渲染 AGENT_SYSTEM_TOOLS 模板"""
+        return render(cls.AGENT_SYSTEM_TOOLS, **kwargs)
+
+    @classmethod
+    def agent_user(cls, conversation_history: str) -> str:
+        """渲染 AGENT_USER 模板"""
+        return cls._AGENT_USER_PREFIX + conversation_history + cls._AGENT_USER_SUFFIX
@@ -2,71 +2,56 @@
 轨迹质量评估相关的提示词模板
 """
 
+from typing import Any, Dict, List
 
-class EvaluationPrompts:
-    """轨迹质量评估提示词模板"""
-    
-    TRAJECTORY_EVALUATION_SYSTEM = """
-You are an expert evaluator of multi-turn agent interactions. Your task is to assess the quality of conversation trajectories between users and AI agents.
-
-**Evaluation Framework:**
-
-**1. Task Completion Analysis (Weight: 40%)**
-- Did the agent fully understand the user's initial request and objectives?
-- Were all specified tasks and requirements completed successfully?
-- Was the final outcome satisfactory and complete?
-
-**2. Tool Usage Assessment (Weight: 30%)**
-- Were the correct tools selected for each step?
-- Were tool parameters passed accurately and appropriately?
-- Did the agent handle tool execution results correctly?
-- Was the sequence of tool calls logical and efficient?
-- Did the agent recover gracefully from tool failures?
-
-**3. Interaction Quality Evaluation (Weight: 30%)**
-- Was the communication natural and contextually appropriate?
-- Did the agent ask for clarification when necessary?
-- Were responses timely and relevant?
-- Did the agent maintain conversational context throughout?
-
-**Scoring Scale:** 
-- 1: Poor (major issues, task failed)
-- 2: Below Average (significant problems, partial completion)
-- 3: Average (basic completion with some issues)
-- 4: Good (completed well with minor issues)
-- 5: Excellent (exemplary performance, natural interaction)
-
-Please provide detailed, objective analysis based on the conversation content and tool execution results.
-"""
-
-    TRAJECTORY_EVALUATION_USER = """
-Please evaluate the following multi-turn agent interaction trajectory:
-
-**Task Information:**
-- Task Description: {task_description}
-- Success Criteria: {tool_usage_expectations}
-
-**Conversation Trajectory:**
-{conversation_history}
+from ._blocks import cache_block
+from ._compiled import PromptTemplates, load_template, load_text, minify_json, render
 
-**Tool Execution Results:**
-{tool_results}
 
-Please provide your evaluation in the following JSON format:
-
-```json
-{{
-    "overall_score": 0.0,
-    "analysis": {{
-        "task_completion_analysis": "Detailed analysis of whether the task was completed successfully...",
-        "tool_usage_analysis": "Assessment of tool selection, parameter accuracy, and execution handling...",
-        "interaction_quality_analysis": "Evaluation of communication quality, context maintenance, and user experience...",
-    }},
-}}
-```
+class EvaluationPrompts(PromptTemplates):
+    """轨迹质量评估提示词模板"""
 
-**Evaluation Guidelines:**
-1. Be objective and specific in your analysis
-2. Focus on measurable outcomes and observable behaviors
-3. Consider the user's perspective and satisfaction
-"""
+    __slots__ = ()
+    
+    TRAJECTORY_EVALUATION_SYSTEM = load_text("trajectory_evaluation_system.md")
+
+    TRAJECTORY_EVALUATION_SCHEMA = minify_json(load_text("trajectory_evaluation_schema.json"))
+    TRAJECTORY_EVALUATION_USER = load_template(
+        "trajectory_evaluation_user.md", trajectory_evaluation_schema=TRAJECTORY_EVALUATION_SCHEMA
+    )
+
+    TRAJECTORY_EVALUATION_BATCH_SCHEMA = minify_json(load_text("trajectory_evaluation_batch_schema.json"))
+    TRAJECTORY_BLOCK = load_template("trajectory_block.md")
+    TRAJECTORY_EVALUATION_USER_BATCH = load_template(
+        "trajectory_evaluation_user_batch.md",
+        trajectory_evaluation_batch_schema=TRAJECTORY_EVALUATION_BATCH_SCHEMA,
+    )
+
+    @classmethod
+    def build_evaluation_system(cls) -> List[Dict[str, Any]]:
+        """构建轨迹评估系统提示词内容块：评估框架完全静态，整体缓存"""
+        return [cache_block(cls.TRAJECTORY_EVALUATION_SYSTEM)]
+
+    @classmethod
+    def trajectory_evaluation_user(cls, **kwargs) -> str:
+        """渲染 TRAJECTORY_EVALUATION_USER 模板"""
+        return render(cls.TRAJECTORY_EVALUATION_USER, **kwargs)
+
+    @classmethod
+    def trajectory_block(cls, **kwargs) -> str:
+        """渲染批量评估中单条轨迹的片段"""
+        return render(cls.TRAJECTORY_BLOCK, **kwargs)
+
+    @classmethod
+    def trajectory_evaluation_user_batch(cls, trajectories: List[Dict[str, Any]]) -> str:
+        """
+        渲染批量评估提示词，一次调用评估多条轨迹
+
+        Args:
+            trajectories: 每项为 trajectory_block 所需的参数字典
+        """
+        return render(
+            cls.TRAJECTORY_EVALUATION_USER_BATCH,
+            n=len(trajectories),
+            trajectories_block="\n".join(cls.render_many("TRAJECTORY_BLOCK", trajectories)),
+        )
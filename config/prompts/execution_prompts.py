@@ -2,50 +2,29 @@
 工具执行模拟器相关的提示词模板
 """
 
+from typing import Any, Dict, List
 
-class ExecutionPrompts:
+from ._blocks import cache_block
+from ._compiled import PromptTemplates, load_template, load_text, render
+
+
+class ExecutionPrompts(PromptTemplates):
     """工具执行模拟器提示词模板"""
+
+    __slots__ = ()
     
     # 工具执行模拟系统提示词
-    TOOL_EXECUTION_SYSTEM = """
-You are a **Tool Execution Simulator** within an AI system. Your role is to simulate the execution results of various tools. Based on the tool’s functional description and input parameters, you must generate reasonable and realistic execution outcomes.  
-
-## Core Principles
-1. **Authenticity**: The simulated results should accurately reflect how the real tool would behave.  
-2. **Consistency**: The same input must always produce the same output (unless the tool’s behavior is inherently random).  
-3. **Error Handling**: Appropriately simulate possible errors, warnings, or exceptions.  
-4. **State Management**: Maintain continuity of the tool’s execution state across interactions.  
-
-## Execution Result Types
-- **Success**: The tool executes normally and returns the expected result.  
-- **Partial Success**: The tool executes successfully but with warnings or incomplete information.  
-- **Failure**: The execution fails due to issues such as invalid parameters, insufficient permissions, or other errors.  
-
-## Output Format
-Always return results strictly in the JSON format defined by the tool’s expected schema.  
-```
-"""
+    TOOL_EXECUTION_SYSTEM = load_text("tool_execution_system.md")
 
     # 工具执行结果模板
-    EXECUTION_RESULT_TEMPLATE = """
-Simulate the execution of the specified tool.  
-
-### Inputs  
-- **Tool Call:** {tool_call}  
-- **Tool Examples:** {examples}  
-- **Current State:** {current_state} 
-- **Execution Type:** {execution_type}
-
-### Requirements  
-- Verify that parameters are valid and complete.  
-- Reflect the tool’s expected behavior and constraints.  
-- Appropriately simulate possible errors or exceptions.  
-- Update and maintain the system state based on execution.  
-- Follow the structure and formatting shown in the provided examples.  
-- Please use the execution type to determine the execution result.
-- Please refer to the Current State and ensure the generated result is consistent with the current state.
-
-### Output  
-Return a realistic execution result strictly in JSON format, consistent with the tool’s schema.  
-"""
+    EXECUTION_RESULT_TEMPLATE = load_template("execution_result_template.md")
+
+    @classmethod
+    def build_execution_system(cls) -> List[Dict[str, Any]]:
+        """构建工具执行系统提示词内容块：完全静态，整体缓存（动态输入放在EXECUTION_RESULT_TEMPLATE中）"""
+        return [cache_block(cls.TOOL_EXECUTION_SYSTEM)]
 
+    @classmethod
+    def execution_result(cls, **kwargs) -> str:
+        """渲染 EXECUTION_RESULT_TEMPLATE 模板"""
+        return render(cls.EXECUTION_RESULT_TEMPLATE, **kwargs)
@@ -2,38 +2,18 @@
 场景生成相关的提示词模板
 """
 
+from ._compiled import PromptTemplates, load_template, load_text, minify_json, render
 
-class ScenarioPrompts:
-    """场景生成提示词模板"""
-    
-    SCENARIO_GENERATION = """
-You are a professional application scenario designer responsible for generating rich and diverse application scenarios for a multi-agent data synthesis project.
 
-Please generate {count} specific application scenarios based on the following domain:  
-Domain: {domain}
+class ScenarioPrompts(PromptTemplates):
+    """场景生成提示词模板"""
 
-Each scenario should include:  
-1. Scenario name (concise and clear)  
-2. Detailed description (100-200 words)  
-3. Application   
-4. Typical user needs
+    __slots__ = ()
 
-Requirements:  
-- Scenarios should be realistic, practical and high frequency
-- Descriptions must be specific and avoid being too abstract  
-- Use cases should cover different situations  
-- Ensure sufficient differences between scenarios  
-- Consider the needs of different user groups
+    SCENARIO_SCHEMA = minify_json(load_text("scenario_schema.json"))
+    SCENARIO_GENERATION = load_template("scenario_generation.md", scenario_schema=SCENARIO_SCHEMA)
 
-Please output in JSON format with the following structure:  
-```json  
-[  
-  {{
-    "name": "Scenario Name",  
-    "description": "Detailed description",  
-    "context": "Application context",
-    "target_users": ["Target user groups"]  
-  }}  
-]
-```
-"""
\ No newline at end of file
+    @classmethod
+    def scenario_generation(cls, **kwargs) -> str:
+        """渲染 SCENARIO_GENERATION 模板"""
+        return render(cls.SCENARIO_GENERATION, **kwargs)
@@ -0,0 +1,3 @@
+"""
+提示词模板正文（.md / .json），由 config.prompts._compiled.load_text 按需读取
+"""
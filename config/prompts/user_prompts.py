@@ -2,9 +2,38 @@
 用户模拟器相关的提示词模板
 """
 
+import functools
+import sys
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
-class UserPrompts:
+from ._blocks import cache_block, text_block
+from ._compiled import PromptTemplates, load_template, load_text, render
+
+
+def _interned(descriptions: Dict[str, str]) -> Mapping[str, str]:
+    """驻留描述字符串并包装为只读映射"""
+    return MappingProxyType({sys.intern(key): sys.intern(value) for key, value in descriptions.items()})
+
+
+def _characteristics_by_pair(personalities: Mapping[str, str], styles: Mapping[str, str],
+                             template) -> Mapping[Tuple[str, str], str]:
+    """预先渲染全部 (人格, 风格) 组合的用户特征描述"""
+    return MappingProxyType({
+        (personality, style): sys.intern(render(
+            template,
+            personality_description=personality_description,
+            style_description=style_description
+        ))
+        for personality, personality_description in personalities.items()
+        for style, style_description in styles.items()
+    })
+
+
+class UserPrompts(PromptTemplates):
     """用户模拟器提示词模板"""
+
+    __slots__ = ()
     
     # # 人格类型描述
     # PERSONALITY_DESCRIPTIONS = {
@@ -22,18 +51,19 @@ class UserPrompts:
     #     'life_oriented': '偏向生活化的交流方式，关注实用性和易懂性'
     # }
 
-    PERSONALITY_DESCRIPTIONS = {
+    # 只读映射（字符串已驻留），多线程/多进程间共享无需拷贝
+    PERSONALITY_DESCRIPTIONS = _interned({
         'friendly': 'Friendly, enthusiastic, helpful, and displays a positive attitude in communication',
         'impatient': 'Impatient, wants to solve problems quickly, dislikes lengthy explanations',
         'cautious': 'Cautious and careful, double-checks before making decisions, worries about making mistakes',
         'casual': 'Casual and relaxed, uses informal language, does not care much about formality'
-    }
+    })
 
-    STYLE_DESCRIPTIONS = {
+    STYLE_DESCRIPTIONS = _interned({
         'formal': 'Formal and polite communication style, using precise and proper language',
         'informal': 'Informal and relaxed communication style, using casual and natural language',
         'life_oriented': 'Life-oriented communication style, focusing on practicality and ease of understanding'
-    }
+    })
     
     # 基础用户模拟系统提示词
 #     USER_SIMULATION_SYSTEM = """你是一个AI系统中的用户模拟器，负责根据给定的任务指令和用户特征来模拟真实用户的行为和表达方式。
@@ -61,76 +91,20 @@ class UserPrompts:
 # 请根据以上指导原则，以真实用户的身份与AI助手进行自然对话。"""
 
 
-    USER_SIMULATION_SYSTEM = """
-You are a user interacting with an agent.
-# Task:
-{task_instruction}
-
-# User Characteristics:
-{user_characteristics}
-
-# Rules:
-- Just generate one line at a time to simulate the user’s message.
-- Do not give away all the instruction at once. Only provide the information that
-is necessary for the current step.
-- Do not hallucinate information that is not provided in the instruction. Follow
-these guidelines:
-1. If the agent asks for information NOT in the instruction:
-- Say you don’t remember or don’t have it
-- Offer alternative information that IS mentioned in the instruction
-2. Examples:
-- If asked for order ID (not in instruction): “Sorry, I don’t remember the order
-ID, can you search for it? My name/email/phone number/zipcode is ...”
-- If asked for email (not in instruction): “I don’t have my email handy, but I
-can give you my name and zip code which are...”
-- Do not repeat the exact instruction in the conversation. Instead, use your own
-words to convey the same information.
-- Try to make the conversation as natural as possible, and stick to the
-personalities in the instruction.
-# Constraint Handling:
-- Provide requests strictly based on what is explicitly stated in the instruction.
-- Do not assume, extend, substitute, or generalize in any form.
-- Do not modify or relax constraints on:
-- Time / Date
-- Budget
-- Specific terms (e.g., ‘‘same’’ must not be replaced with ‘‘similar’’)
-- Core Rule: Any attribute NOT mentioned in the instruction can be either changed
-or kept the same
-- Examples:
-- If instruction says ‘‘exchange red item to blue’’: Only color must change, other
-attributes (size, material, etc.) are flexible
-- If instruction says ‘‘exchange red item to blue, keep the same size’’: Both
-color must change AND size must stay the same
-- Exception: Only follow additional constraints when explicitly stated in the
-instruction
-# When NOT to finish the conversation:
-- Do not end until you have clearly and completely expressed all your requirements
-and constraints.
-- Do not end until the agent has completed all tasks mentioned in the instruction
-and verified no operations were missed.
-- Do not end if the agent’s execution results do not match your expectations or
-are incorrect/incomplete.
-# When you CAN finish the conversation:
-
-- Only when all above conditions are satisfied AND all tasks are completed
-correctly.
-- OR when you have clearly expressed complete requirements but the system
-explicitly states it cannot complete them due to technical limitations - in this
-case, accept transfer to human.
-# How to finish the conversation:
-- If the agent has completed all tasks, generate "finish conversation" as a standalone
-message without anything else to end the conversation.
-# Note:
-- You should carefully check if the agent has completed all tasks mentioned in the
-instruction before generating "finish conversation".
-"""
+    # 静态用户模拟规则前缀（可缓存）
+    USER_SIMULATION_RULES = load_text("user_simulation_rules.md")
+
+    # 动态任务与用户特征尾部
+    USER_SIMULATION_CONTEXT = load_template("user_simulation_context.md")
 
 
     # 用户特征模板
-    USER_CHARACTERISTICS_TEMPLATE = """
-**personality**: {personality_description}
-**style**: {style_description}
-"""
+    USER_CHARACTERISTICS_TEMPLATE = load_template("user_characteristics_template.md")
+
+    # 人格×风格组合的用户特征描述（导入时一次性渲染）
+    USER_CHARACTERISTICS_BY_PAIR = _characteristics_by_pair(
+        PERSONALITY_DESCRIPTIONS, STYLE_DESCRIPTIONS, USER_CHARACTERISTICS_TEMPLATE
+    )
 
     # 初始化对话提示词
 #     INIT_CONVERSATION = """基于你的任务指令和个人特征，现在AI助手询问："今天有什么需要帮助的吗？"
@@ -145,15 +119,85 @@ instruction before generating "finish conversation".
 
 # 请根据你的人格特征和任务目标，生成自然、符合角色设定的回复。记住要推进任务进度，但不要一次性透露所有信息。"""
 
-    INIT_CONVERSATION = """Based on your task instruction and personal characteristics, the AI assistant asks: "What do you need help with today?"
-
-Please respond to this greeting in your own words and start expressing your needs. Remember to match your personality traits and only reveal the information needed for the first step.
-"""
-
-    USER_RESPONSE_PROMPT = """Based on the conversation history, generate the user's next response:
-
-Conversation history:
-{conversation_history}
-
-Please create a natural response that matches your personality traits and task objectives.
-"""
+    INIT_CONVERSATION = load_text("init_conversation.md")
+    USER_RESPONSE_PROMPT = load_template("user_response_prompt.md")
+
+    # 对话历史超过该轮数后不再标记缓存：缓存写入成本开始超过读取收益
+    CACHE_RESET_TURNS = 40
+
+    @classmethod
+    def build_user_simulation_system(cls, task_instruction: str,
+                                     user_characteristics: str) -> List[Dict[str, Any]]:
+        """构建用户模拟系统提示词内容块：静态规则在前并缓存，任务与用户特征在后"""
+        return [
+            cache_block(cls.USER_SIMULATION_RULES),
+            text_block(cls.user_simulation_context(
+                task_instruction=task_instruction,
+                user_characteristics=user_characteristics
+            )),
+        ]
+
+    @classmethod
+    def build_persona_simulation_system(cls, personality: str, style: str,
+                                        task_instruction: str) -> List[Dict[str, Any]]:
+        """
+        按人格/风格构建用户模拟系统提示词内容块，相同 (人格, 风格, 任务) 组合复用已渲染结果
+
+        Args:
+            personality: 人格类型值，如 "friendly"
+            style: 交互风格值，如 "formal"
+            task_instruction: 任务指令
+        """
+        return list(_persona_simulation_system(personality, style, task_instruction))
+
+    @classmethod
+    def characteristics_for(cls, personality: str, style: str) -> Optional[str]:
+        """获取预渲染的用户特征描述，未知组合返回None"""
+        return cls.USER_CHARACTERISTICS_BY_PAIR.get((personality, style))
+
+    @classmethod
+    def user_simulation_context(cls, **kwargs) -> str:
+        """渲染 USER_SIMULATION_CONTEXT 模板"""
+        return render(cls.USER_SIMULATION_CONTEXT, **kwargs)
+
+    @classmethod
+    def user_characteristics(cls, **kwargs) -> str:
+        """渲染 USER_CHARACTERISTICS_TEMPLATE 模板"""
+        return render(cls.USER_CHARACTERISTICS_TEMPLATE, **kwargs)
+
+    @classmethod
+    def build_turn(cls, history: List[str], reset_hint: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """
+        按轮次构建用户回复提示词内容块：已有历史作为稳定前缀缓存，最新一轮与指令在后
+
+        Args:
+            history: 逐轮的对话历史行
+            reset_hint: 为True时不设置缓存标记，让下一轮从新的缓存窗口开始；
+                        默认在历史超过 CACHE_RESET_TURNS 轮时自动重置
+        """
+        if reset_hint is None:
+            reset_hint = len(history) > cls.CACHE_RESET_TURNS
+
+        # USER_RESPONSE_PROMPT 形如 [(前缀, "conversation_history"), (指令尾部, None)]
+        (header, _), (footer, _) = cls.USER_RESPONSE_PROMPT
+        *previous, latest = history or [""]
+        prefix = header + "".join(line + "\n" for line in previous)
+
+        return [
+            text_block(prefix) if reset_hint else cache_block(prefix),
+            text_block(latest + footer),
+        ]
+
+    @classmethod
+    def user_response(cls, **kwargs) -> str:
+        """渲染 USER_RESPONSE_PROMPT 模板"""
+        return render(cls.USER_RESPONSE_PROMPT, **kwargs)
+
+
+@functools.lru_cache(maxsize=4096)
+def _persona_simulation_system(personality: str, style: str,
+                               task_instruction: str) -> Tuple[Dict[str, Any], ...]:
+    return tuple(UserPrompts.build_user_simulation_system(
+        task_instruction=task_instruction,
+        user_characteristics=UserPrompts.USER_CHARACTERISTICS_BY_PAIR[(personality, style)]
+    ))
@@ -3,10 +3,56 @@
 包含所有模块的配置参数
 """
 
+import functools
 import os
+import threading
 from pathlib import Path
-from typing import Dict, Any, List
-from dotenv import load_dotenv
+from typing import Dict, Any, List, Mapping
+from dotenv import dotenv_values
+
+_DOTENV_LOCK = threading.Lock()
+_dotenv_loaded = False
+
+# 本进程中已确认存在的目录，避免重复的 mkdir 系统调用
+_CREATED_DIRS = set()
+
+
+def _ensure_dir(path: Path):
+    """创建目录（每个路径在进程内只创建一次）"""
+    key = str(path)
+    if key not in _CREATED_DIRS:
+        path.mkdir(parents=True, exist_ok=True)
+        _CREATED_DIRS.add(key)
+
+
+def _load_env_file(env_file: Path):
+    """
+    将 .env 中的变量写入 os.environ（进程内只解析一次，不覆盖已有变量）
+    设置 SKIP_DOTENV 时跳过，适用于环境变量已由部署平台注入的场景
+    """
+    global _dotenv_loaded
+    if _dotenv_loaded or os.environ.get("SKIP_DOTENV"):
+        return
+    with _DOTENV_LOCK:
+        if _dotenv_loaded:
+            return
+        if env_file.exists():
+            for key, value in dotenv_values(env_file).items():
+                if value is not None:
+                    os.environ.setdefault(key, value)
+        _dotenv_loaded = True
+
+
+def _int(env: Mapping[str, str], key: str, default: int) -> int:
+    """读取整数型环境变量"""
+    value = env.get(key)
+    return default if value is None else int(value)
+
+
+def _float(env: Mapping[str, str], key: str, default: float) -> float:
+    """读取浮点型环境变量"""
+    value = env.get(key)
+    return default if value is None else float(value)
 
 
 class Settings:
@@ -18,115 +64,117 @@ class Settings:
         self.DATA_DIR = self.ROOT_DIR / "data"
         
         # 加载 .env 文件
-        env_file = self.ROOT_DIR / ".env"
-        if env_file.exists():
-            load_dotenv(env_file)
+        _load_env_file(self.ROOT_DIR / ".env")
+        env = dict(os.environ)
+        
         # API配置
         self.LLM_CONFIG = {
             "openai": {
-                "api_key": os.getenv("OPENAI_API_KEY", ""),
-                "base_url": os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1"),
-                "model": os.getenv("OPENAI_MODEL", "gpt-4"),
-                "temperature": float(os.getenv("OPENAI_TEMPERATURE", "0.7")),
-                "max_tokens": int(os.getenv("OPENAI_MAX_TOKENS", "2000")),
-                "timeout": int(os.getenv("OPENAI_TIMEOUT", "30"))
+                "api_key": env.get("OPENAI_API_KEY", ""),
+                "base_url": env.get("OPENAI_BASE_URL", "https://api.openai.com/v1"),
+                "model": env.get("OPENAI_MODEL", "gpt-4"),
+                "temperature": _float(env, "OPENAI_TEMPERATURE", 0.7),
+                "max_tokens": _int(env, "OPENAI_MAX_TOKENS", 2000),
+                "timeout": _int(env, "OPENAI_TIMEOUT", 30)
             },
         }
         
         # 默认使用的LLM提供商
-        self.DEFAULT_LLM_PROVIDER = os.getenv("DEFAULT_LLM_PROVIDER", "openai")
+        self.DEFAULT_LLM_PROVIDER = env.get("DEFAULT_LLM_PROVIDER", "openai")
+        self._default_llm_config = self.LLM_CONFIG.get(self.DEFAULT_LLM_PROVIDER, self.LLM_CONFIG["openai"])
         
         # 数据路径配置
+        generated_dir = self.DATA_DIR / "generated"
+        filtered_dir = self.DATA_DIR / "filtered"
+        temp_dir = self.DATA_DIR / "temp"
         self.DATA_PATHS = {
-            "scenarios": self.DATA_DIR / "generated" / "scenarios",
-            "tools": self.DATA_DIR / "generated" / "tools", 
-            "agents": self.DATA_DIR / "generated" / "agents",
-            "tasks": self.DATA_DIR / "generated" / "tasks",
-            "user_personas": self.DATA_DIR / "generated" / "user_personas",
-            "trajectories": self.DATA_DIR / "generated" / "trajectories",
-            "trajectory_evaluations": self.DATA_DIR / "generated" / "trajectory_evaluations",
-            "high_quality_trajectories": self.DATA_DIR / "filtered" / "high_quality_trajectories",
-            "training_data": self.DATA_DIR / "filtered" / "training_data",
-            "temp": self.DATA_DIR / "temp",
-            "cache": self.DATA_DIR / "temp" / "cache"
+            "scenarios": generated_dir / "scenarios",
+            "tools": generated_dir / "tools", 
+            "agents": generated_dir / "agents",
+            "tasks": generated_dir / "tasks",
+            "user_personas": generated_dir / "user_personas",
+            "trajectories": generated_dir / "trajectories",
+            "trajectory_evaluations": generated_dir / "trajectory_evaluations",
+            "high_quality_trajectories": filtered_dir / "high_quality_trajectories",
+            "training_data": filtered_dir / "training_data",
+            "temp": temp_dir,
+            "cache": temp_dir / "cache"
         }
         
         # 生成配置（支持环境变量覆盖）
         self.GENERATION_CONFIG = {
             "scenarios": {
-                "target_count": int(os.getenv("SCENARIO_TARGET_COUNT", "50")),
-                # "domains": [
-                #     "外卖配送", "社交媒体", "金融交易", "软件应用", "机器人控制",
-                #     "电商购物", "在线教育", "医疗健康", "旅游出行", "智能家居",ß
-                #     "企业办公", "内容创作", "游戏娱乐", "新闻媒体", "客户服务"
-                # ],
+                "target_count": _int(env, "SCENARIO_TARGET_COUNT", 50),
+                # 中文领域：外卖配送、社交媒体、金融交易、软件应用、机器人控制、电商购物、在线教育、
+                # 医疗健康、旅游出行、智能家居、企业办公、内容创作、游戏娱乐、新闻媒体、客户服务
                 "domains": [
                     "food_delivery",
                     "robot_control",
                     "social_media",
                     "ecommerce",
                     "travel",
-                    ],
-                "batch_size": int(os.getenv("SCENARIO_BATCH_SIZE", "10"))
+                ],
+                "batch_size": _int(env, "SCENARIO_BATCH_SIZE", 10)
             },
             # "tools": {
-            #     "target_count": int(os.getenv("TOOL_TARGET_COUNT", "3000")),
-            #     "tools_per_scenario": int(os.getenv("TOOLS_PER_SCENARIO", "8")),
-            #     "max_parameters_per_tool": int(os.getenv("MAX_PARAMETERS_PER_TOOL", "6")),
-            #     "batch_size": int(os.getenv("TOOL_BATCH_SIZE", "20"))
+            #     "target_count": _int(env, "TOOL_TARGET_COUNT", 3000),
+            #     "tools_per_scenario": _int(env, "TOOLS_PER_SCENARIO", 8),
+            #     "max_parameters_per_tool": _int(env, "MAX_PARAMETERS_PER_TOOL", 6),
+            #     "batch_size": _int(env, "TOOL_BATCH_SIZE", 20)
             # },
             "tools": {
-                "tools_per_scenario": int(os.getenv("TOOLS_PER_SCENARIO", "10")),
-                "batch_size": int(os.getenv("TOOL_BATCH_SIZE", "5"))
+                "tools_per_scenario": _int(env, "TOOLS_PER_SCENARIO", 10),
+                "batch_size": _int(env, "TOOL_BATCH_SIZE", 5)
             },
             "agents": {
-                "target_count": int(os.getenv("AGENT_TARGET_COUNT", "1000")),
+                "target_count": _int(env, "AGENT_TARGET_COUNT", 1000),
                 "tools_per_agent": {
-                    "min": int(os.getenv("AGENT_MIN_TOOLS", "3")), 
-                    "max": int(os.getenv("AGENT_MAX_TOOLS", "6"))
+                    "min": _int(env, "AGENT_MIN_TOOLS", 3), 
+                    "max": _int(env, "AGENT_MAX_TOOLS", 6)
                 },
-                "batch_size": int(os.getenv("AGENT_BATCH_SIZE", "50"))
+                "batch_size": _int(env, "AGENT_BATCH_SIZE", 50)
             },
             "tasks": {
                 "tasks_per_difficulty": 1,
                 "max_workers": 64
             },
             "user_personas": {
-                "target_count": int(os.getenv("USER_PERSONA_TARGET_COUNT", "500")),
+                "target_count": _int(env, "USER_PERSONA_TARGET_COUNT", 500),
                 "personality_types": [
                     "friendly", "impatient", "cautious", "casual"
                 ],
                 "interaction_styles": [
                     "formal", "informal", "life_oriented"
                 ],
-                "batch_size": int(os.getenv("USER_PERSONA_BATCH_SIZE", "25"))
+                "batch_size": _int(env, "USER_PERSONA_BATCH_SIZE", 25)
             },
             "trajectories": {
-                "max_count": int(os.getenv("TRAJECTORY_MAX_COUNT", "1000")),
-                "max_workers": int(os.getenv("TRAJECTORY_MAX_WORKERS", "64")),
-                "max_turns": int(os.getenv("TRAJECTORY_MAX_TURNS", "40"))
+                "max_count": _int(env, "TRAJECTORY_MAX_COUNT", 1000),
+                "max_workers": _int(env, "TRAJECTORY_MAX_WORKERS", 64),
+                "max_turns": _int(env, "TRAJECTORY_MAX_TURNS", 40)
             }
         }
         
         # 质量评估配置（支持环境变量覆盖）
         self.QUALITY_CONFIG = {
             "score_thresholds": {
-                "pass_threshold": float(os.getenv("QUALITY_PASS_THRESHOLD", "4.0")),
-                "high_quality_threshold": float(os.getenv("QUALITY_HIGH_THRESHOLD", "4.5"))
-            }
+                "pass_threshold": _float(env, "QUALITY_PASS_THRESHOLD", 4.0),
+                "high_quality_threshold": _float(env, "QUALITY_HIGH_THRESHOLD", 4.5)
+            },
+            "batch_size": _int(env, "QUALITY_BATCH_SIZE", 5)  # 每次LLM调用评估的轨迹数
         }
         
         # 模拟器配置
         self.SIMULATOR_CONFIG = {
-            "success_rate": float(os.getenv("SIMULATOR_SUCCESS_RATE", "0.85")),     # 工具执行成功率
-            "partial_failure_rate": float(os.getenv("SIMULATOR_PARTIAL_FAILURE_RATE", "0.10")),  # 部分失败率
-            "complete_failure_rate": float(os.getenv("SIMULATOR_COMPLETE_FAILURE_RATE", "0.05")),  # 完全失败率
+            "success_rate": _float(env, "SIMULATOR_SUCCESS_RATE", 0.85),     # 工具执行成功率
+            "partial_failure_rate": _float(env, "SIMULATOR_PARTIAL_FAILURE_RATE", 0.10),  # 部分失败率
+            "complete_failure_rate": _float(env, "SIMULATOR_COMPLETE_FAILURE_RATE", 0.05),  # 完全失败率
             "state_persistence": True  # 是否持久化状态
         }
         
         # 日志配置
         self.LOGGING_CONFIG = {
-            "level": os.getenv("LOG_LEVEL", "INFO"),
+            "level": env.get("LOG_LEVEL", "INFO"),
             "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
             "file_path": self.ROOT_DIR / "logs" / "agent_data_gen.log",
             "max_size": "10MB",
@@ -135,9 +183,15 @@ class Settings:
         
         # 并发配置
         self.CONCURRENCY_CONFIG = {
-            "max_workers": int(os.getenv("MAX_WORKERS", "4")),
+            "max_workers": _int(env, "MAX_WORKERS", 4),
             "batch_processing": True,
-            "timeout": int(os.getenv("PROCESSING_TIMEOUT", "300"))
+            "timeout": _int(env, "PROCESSING_TIMEOUT", 300)
+        }
+        
+        # 可通过 update_config 更新的配置段（构造时一次性确定）
+        self._updatable = {
+            name: value for name, value in vars(self).items()
+            if name.isupper() and isinstance(value, dict)
         }
         
         # 创建必要的目录
@@ -146,15 +200,15 @@ class Settings:
     def _create_directories(self):
         """创建必要的数据目录"""
         for path in self.DATA_PATHS.values():
-            path.mkdir(parents=True, exist_ok=True)
+            _ensure_dir(path)
         
         # 创建日志目录
-        log_dir = self.ROOT_DIR / "logs"
-        log_dir.mkdir(exist_ok=True)
+        _ensure_dir(self.ROOT_DIR / "logs")
     
     def get_llm_config(self, provider: str = None) -> Dict[str, Any]:
         """获取LLM配置"""
-        provider = provider or self.DEFAULT_LLM_PROVIDER
+        if not provider or provider == self.DEFAULT_LLM_PROVIDER:
+            return self._default_llm_config
         return self.LLM_CONFIG.get(provider, self.LLM_CONFIG["openai"])
     
     def get_data_path(self, data_type: str) -> Path:
@@ -163,15 +217,24 @@ class Settings:
     
     def update_config(self, section: str, updates: Dict[str, Any]):
         """更新配置"""
-        if hasattr(self, section):
-            config = getattr(self, section)
-            if isinstance(config, dict):
-                config.update(updates)
-            else:
+        config = self._updatable.get(section)
+        if config is None:
+            if hasattr(self, section):
                 raise ValueError(f"Config section {section} is not a dictionary")
-        else:
             raise ValueError(f"Config section {section} does not exist")
+        config.update(updates)
+        if section == "LLM_CONFIG":
+            self._default_llm_config = self.LLM_CONFIG.get(self.DEFAULT_LLM_PROVIDER, self.LLM_CONFIG["openai"])
+
+
+@functools.lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """获取全局配置实例（首次调用时构建）"""
+    return Settings()
 
 
-# 创建全局配置实例
-settings = Settings() 
\ No newline at end of file
+def __getattr__(name):
+    # 兼容 `from config.settings import settings`：首次访问时才构建全局配置实例
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}") 
\ No newline at end of file
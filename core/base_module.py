@@ -17,6 +17,9 @@ class BaseModule(ABC):
     提供通用的功能和接口
     """
     
+    # 基类声明 __slots__，子类同样声明后实例不再携带 __dict__（未声明的子类行为不变）
+    __slots__ = ('config', 'logger', 'metadata', '_initialized', '__weakref__')
+    
     def __init__(self, config: Dict[str, Any] = None, logger: logging.Logger = None):
         """
         初始化基础模块
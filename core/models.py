@@ -3,12 +3,20 @@
 定义系统中使用的所有数据结构
 """
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields, is_dataclass
 from typing import List, Dict, Any, Optional, Union
 from enum import Enum
 import json
+import operator
+import sys
+import time
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时回退到标准库 json
+    orjson = None
+
 
 class DifficultyLevel(Enum):
     """任务难度级别"""
@@ -38,7 +46,30 @@ class InteractionStyle(Enum):
     LIFE_ORIENTED = "life_oriented"
 
 
-@dataclass
+# 枚举成员是单例，序列化时直接查表取值
+_ENUM_VALUES = {
+    member: member.value
+    for enum_cls in (DifficultyLevel, TaskType, UserPersonalityType, InteractionStyle)
+    for member in enum_cls
+}
+
+# 对话发言方到训练数据角色的映射（未列出的发言方不进入训练数据）
+_ROLE_MAP = {"user": "user", "agent": "assistant", "execution": "execution"}
+# 一次取出对话轮次的 (speaker, recipient, message)，属性读取在C层完成
+_TURN_FIELDS = operator.attrgetter("speaker", "recipient", "message")
+# 训练数据JSON的预构建模板：每条消息的 role 前缀按发言方预先拼好，外层结构只做一次字符串格式化
+_MESSAGE_PREFIX = {
+    speaker: '{"role":"%s","content":' % role for speaker, role in _ROLE_MAP.items()
+}
+_TRAINING_JSON_TEMPLATE = (
+    '{{"trajectory_id":{trajectory_id},"task_id":{task_id},"agent_id":{agent_id},'
+    '"messages":[{messages}],"score":{score},'
+    '"metadata":{{"quality_tags":{quality_tags},"is_high_quality":{is_high_quality},'
+    '"session_metadata":{session_metadata}}}}}'
+)
+
+
+@dataclass(slots=True)
 class Scenario:
     """场景数据模型"""
     id: str
@@ -52,7 +83,7 @@ class Scenario:
     created_at: datetime = field(default_factory=datetime.now)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ToolParameter:
     """工具参数"""
     name: str
@@ -63,7 +94,7 @@ class ToolParameter:
     enum: Optional[List[str]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Tool:
     """工具数据模型"""
     id: str
@@ -76,9 +107,16 @@ class Tool:
     examples: List[Dict[str, Any]] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
     created_at: datetime = field(default_factory=datetime.now)
+    # 缓存的函数schema（工具构建后参数不再变化，首次调用时生成）
+    _function_schema: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
 
     def to_function_schema(self) -> Dict[str, Any]:
-        """转换为函数调用的schema格式"""
+        """转换为函数调用的schema格式（结果在实例上缓存）"""
+        if self._function_schema is None:
+            self._function_schema = self._build_function_schema()
+        return self._function_schema
+
+    def _build_function_schema(self) -> Dict[str, Any]:
         properties = {}
         required = []
         
@@ -103,7 +141,7 @@ class Tool:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentConfig:
     """智能体配置"""
     id: str
@@ -112,7 +150,7 @@ class AgentConfig:
     created_at: datetime = field(default_factory=datetime.now)
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskRubric:
     """任务评分标准"""
     success_criteria: List[str] = field(default_factory=list)
@@ -120,7 +158,7 @@ class TaskRubric:
     checkpoints: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     """任务数据模型"""
     id: str
@@ -135,7 +173,7 @@ class Task:
     created_at: datetime = field(default_factory=datetime.now)
 
 
-@dataclass
+@dataclass(slots=True)
 class UserPersona:
     """用户人格模型"""
     id: str
@@ -146,17 +184,29 @@ class UserPersona:
     created_at: datetime = field(default_factory=datetime.now)
 
 
-@dataclass
+@dataclass(slots=True)
 class ConversationTurn:
     """对话轮次"""
     speaker: str  # "user", "agent", "execution"
     recipient: str  # "user", "agent", "execution"
     message: str
-    timestamp: datetime = field(default_factory=datetime.now)
+    timestamp: float = field(default_factory=time.time)  # Unix时间戳（秒），比构造datetime更轻量
     metadata: Dict[str, Any] = field(default_factory=dict)
 
+    @property
+    def timestamp_datetime(self) -> datetime:
+        """以datetime形式返回轮次时间"""
+        return datetime.fromtimestamp(self.timestamp)
+
+    def __post_init__(self):
+        # 发言方/接收方只有少数几个取值，驻留后各轮次共享同一字符串对象
+        if isinstance(self.speaker, str):
+            self.speaker = sys.intern(self.speaker)
+        if isinstance(self.recipient, str):
+            self.recipient = sys.intern(self.recipient)
+
 
-@dataclass
+@dataclass(slots=True)
 class InteractionSession:
     """交互会话"""
     id: str
@@ -170,7 +220,7 @@ class InteractionSession:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TrajectoryScore:
     """轨迹评分"""
     overall_score: float
@@ -181,7 +231,7 @@ class TrajectoryScore:
         return self.overall_score >= self.pass_threshold
 
 
-@dataclass
+@dataclass(slots=True)
 class Trajectory:
     """完整的交互轨迹"""
     id: str
@@ -193,26 +243,11 @@ class Trajectory:
     
     def to_training_format(self) -> Dict[str, Any]:
         """转换为训练数据格式"""
-        messages = []
-        for turn in self.session.turns:
-            if turn.speaker == "user":
-                messages.append({
-                    "role": "user", 
-                    "content": turn.message,
-                    "recipient": turn.recipient
-                })
-            elif turn.speaker == "agent":
-                messages.append({
-                    "role": "assistant", 
-                    "content": turn.message,
-                    "recipient": turn.recipient
-                })
-            elif turn.speaker == "execution":
-                messages.append({
-                    "role": "execution",
-                    "content": turn.message,
-                    "recipient": turn.recipient
-                })
+        messages = [
+            {"role": _ROLE_MAP[speaker], "content": content, "recipient": recipient}
+            for speaker, recipient, content in map(_TURN_FIELDS, self.session.turns)
+            if speaker in _ROLE_MAP
+        ]
         
         return {
             "trajectory_id": self.id,
@@ -227,27 +262,82 @@ class Trajectory:
             }
         }
 
+    
+    def to_training_json(self) -> str:
+        """
+        直接生成训练数据格式的紧凑JSON字符串（与 to_training_format 内容一致）
+        不构建外层字典，只对各字段值做序列化后填入预构建模板
+        """
+        messages = ",".join(
+            f'{_MESSAGE_PREFIX[speaker]}{_dumps_compact(content)},"recipient":{_dumps_compact(recipient)}}}'
+            for speaker, recipient, content in map(_TURN_FIELDS, self.session.turns)
+            if speaker in _MESSAGE_PREFIX
+        )
+        session = self.session
+        return _TRAINING_JSON_TEMPLATE.format(
+            trajectory_id=_dumps_compact(self.id),
+            task_id=_dumps_compact(session.task_id),
+            agent_id=_dumps_compact(session.agent_id),
+            messages=messages,
+            score=_dumps_compact(self.evaluation_score.overall_score if self.evaluation_score else None),
+            quality_tags=_dumps_compact(self.quality_tags),
+            is_high_quality="true" if self.is_high_quality else "false",
+            session_metadata=_dumps_compact(session.metadata),
+        )
+
 
 # 工具类函数
+def _json_default(obj):
+    """序列化 datetime / Enum 等非JSON原生类型"""
+    try:
+        return _ENUM_VALUES[obj]
+    except (KeyError, TypeError):
+        pass
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _str_default(obj):
+    """与 FileManager.save_json 保持一致：无法识别的类型退化为 str()"""
+    try:
+        return _json_default(obj)
+    except TypeError:
+        return str(obj)
+
+
+def _dumps_compact(value: Any) -> str:
+    """将单个值序列化为紧凑JSON片段"""
+    if orjson is not None:
+        return orjson.dumps(value, default=_str_default, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=_str_default)
+
+
+def _dataclass_field_value(value: Any) -> Any:
+    """嵌套的dataclass（含列表中的）序列化为JSON字符串，与原有输出格式保持一致"""
+    if is_dataclass(value):
+        return serialize_dataclass(value)
+    if isinstance(value, list):
+        return [serialize_dataclass(item) if is_dataclass(item) else item for item in value]
+    return value
+
+
 def serialize_dataclass(obj) -> str:
-    """序列化dataclass对象为JSON字符串"""
-    if hasattr(obj, '__dataclass_fields__'):
-        # 处理dataclass
-        data = {}
-        for field_name, field_def in obj.__dataclass_fields__.items():
-            value = getattr(obj, field_name)
-            if isinstance(value, datetime):
-                data[field_name] = value.isoformat()
-            elif isinstance(value, Enum):
-                data[field_name] = value.value
-            elif hasattr(value, '__dataclass_fields__'):
-                data[field_name] = serialize_dataclass(value)
-            elif isinstance(value, list):
-                data[field_name] = [serialize_dataclass(item) if hasattr(item, '__dataclass_fields__') else item for item in value]
-            else:
-                data[field_name] = value
-        return json.dumps(data, ensure_ascii=False, indent=2)
-    return json.dumps(obj, ensure_ascii=False, indent=2)
+    """序列化dataclass对象为JSON字符串（下划线开头的内部缓存字段不输出）"""
+    if is_dataclass(obj):
+        obj = {
+            f.name: _dataclass_field_value(getattr(obj, f.name))
+            for f in fields(obj) if not f.name.startswith("_")
+        }
+    if orjson is not None:
+        # datetime 交给 _json_default 输出 isoformat()，与标准库分支一致
+        return orjson.dumps(
+            obj, default=_json_default,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        ).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, indent=2, default=_json_default)
 
 
 def deserialize_dataclass(cls, data: Union[str, dict]):
@@ -3,12 +3,10 @@
 负责模拟智能体的行为和决策
 """
 
-import json
-import re
+import asyncio
 from typing import Dict, Any, List
 import logging
 
-
 import sys
 from pathlib import Path
 
@@ -17,11 +15,21 @@ from core.models import AgentConfig
 from core.exceptions import AgentDataGenException
 from utils.llm_client import LLMClient
 from config.prompts.agent_prompts import AgentPrompts
+from utils.tool_call_parser import FENCED_BLOCK_RE, is_valid_tool_call_json, iter_json_candidates
+
+# LLM调用失败时返回给用户的兜底消息
+_FALLBACK_MESSAGE = {
+    "sender": "agent",
+    "recipient": "user",
+    "message": "抱歉，我遇到了一些问题，请稍后再试。"
+}
 
 
 class AgentSimulator(BaseModule):
     """智能体模拟器"""
     
+    __slots__ = ('llm_client', 'prompts', 'current_agent_config', 'tools_info')
+    
     def __init__(self, config: Dict[str, Any] = None, logger: logging.Logger = None):
         """
         初始化智能体模拟器
@@ -78,35 +86,59 @@ class AgentSimulator(BaseModule):
             
             system_prompt = self.current_agent_config.system_prompt
             # 构建用户提示词
-            user_prompt = self.prompts.AGENT_USER.format(conversation_history=conversation_history)
+            user_prompt = self.prompts.agent_user(conversation_history=conversation_history)
             # 调用LLM生成响应
             response = self.llm_client.generate_completion(
                 prompt=user_prompt,
                 system_prompt=system_prompt
             )
             
-            response_content = response.content.strip()
-            # 构建当前消息
-            current_message = {"sender": "agent"}
-            
-            # 判断是否包含工具调用
-            # 参考other_project_fils的逻辑
-            if self._contains_tool_call(response_content):
-                current_message["recipient"] = "execution"
-                current_message["message"] = response_content
-            else:
-                current_message["recipient"] = "user"
-                current_message["message"] = response_content
-            
-            return current_message
+            return self._build_message(response.content.strip())
             
         except Exception as e:
             self.logger.error(f"Failed to generate agent response: {e}")
-            return {
-                "sender": "agent",
-                "recipient": "user",
-                "message": "抱歉，我遇到了一些问题，请稍后再试。"
-            }
+            return dict(_FALLBACK_MESSAGE)
+    
+    async def respond_batch(self, conversation_histories: List[str]) -> List[Dict[str, Any]]:
+        """
+        并发为多段对话历史生成智能体响应（共用当前智能体配置）
+        各请求通过 asyncio.gather 同时发出，单个失败只影响对应的响应
+        
+        Args:
+            conversation_histories: 对话历史列表
+            
+        Returns:
+            与输入顺序一致的响应字典列表
+        """
+        if not self.current_agent_config:
+            raise AgentDataGenException("No agent configuration set")
+        
+        system_prompt = self.current_agent_config.system_prompt
+        responses = await asyncio.gather(
+            *(
+                self.llm_client.agenerate_completion(
+                    prompt=self.prompts.agent_user(conversation_history=history),
+                    system_prompt=system_prompt
+                )
+                for history in conversation_histories
+            ),
+            return_exceptions=True
+        )
+        
+        messages = []
+        for response in responses:
+            if isinstance(response, BaseException):
+                self.logger.error(f"Failed to generate agent response: {response}")
+                messages.append(dict(_FALLBACK_MESSAGE))
+            else:
+                messages.append(self._build_message(response.content.strip()))
+        return messages
+    
+    def _build_message(self, response_content: str) -> Dict[str, Any]:
+        """根据响应内容构建消息：包含工具调用时发往 execution，否则发往 user"""
+        # 参考other_project_fils的逻辑
+        recipient = "execution" if self._contains_tool_call(response_content) else "user"
+        return {"sender": "agent", "recipient": recipient, "message": response_content}
     
     def _contains_tool_call(self, response_content: str) -> bool:
         """
@@ -120,39 +152,25 @@ class AgentSimulator(BaseModule):
             是否包含工具调用
         """
         try:
-            # 1. 首先尝试解析 ```json ... ``` 格式
-            json_code_pattern = r'```json\s*(.*?)\s*```'
-            match = re.search(json_code_pattern, response_content, re.DOTALL)
-            
-            if match:
-                json_content = match.group(1).strip()
-                if self._is_valid_tool_call_json(json_content):
-                    return True
-            
-            # 2. 尝试解析 ``` ... ``` 格式（不指定语言）
-            code_block_pattern = r'```\s*(.*?)\s*```'
-            match = re.search(code_block_pattern, response_content, re.DOTALL)
+            # 工具调用必然是JSON对象，不含 { 的纯文本回复直接跳过所有正则匹配
+            if '{' not in response_content:
+                return False
             
-            if match:
-                code_content = match.group(1).strip()
-                if self._is_valid_tool_call_json(code_content):
-                    return True
+            if '```' in response_content:
+                # 1/2. 解析 ```json ... ``` 或 ``` ... ``` 代码块（单个模式一次遍历）
+                for match in FENCED_BLOCK_RE.finditer(response_content):
+                    if self._is_valid_tool_call_json(match.group(1)):
+                        return True
             
-            # 3. 尝试提取普通的 JSON 对象
-            # 改进的正则表达式，更好地处理嵌套JSON
-            json_object_pattern = r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}'
-            json_matches = re.finditer(json_object_pattern, response_content)
+            # 3. 尝试提取普通的 JSON 对象（孤立的未闭合 { 不影响其后的JSON）
+            for _ in iter_json_candidates(response_content, accept=self._is_valid_tool_call_json):
+                return True
             
-            for match in json_matches:
-                json_str = match.group(0)
-                if self._is_valid_tool_call_json(json_str):
+            # 4. 整个响应就是一个JSON对象（json 解析本身可容忍换行和多余空格，无需先压缩空白）
+            stripped = response_content.strip()
+            if stripped.startswith('{') and stripped.endswith('}'):
+                if self._is_valid_tool_call_json(stripped):
                     return True
-            
-            # 4. 尝试提取单行JSON（处理可能的换行符）
-            # 移除换行符和多余空格后尝试解析
-            cleaned_content = re.sub(r'\s+', ' ', response_content.strip())
-            if self._is_valid_tool_call_json(cleaned_content):
-                return True
                 
             return False
 
@@ -160,40 +178,8 @@ class AgentSimulator(BaseModule):
             self.logger.error(f"Failed to check tool call: {e}")
             return False
     
-    def _is_valid_tool_call_json(self, json_str: str) -> bool:
-        """
-        验证JSON字符串是否为有效的工具调用格式
-        
-        Args:
-            json_str: JSON字符串
-            
-        Returns:
-            是否为有效的工具调用
-        """
-        try:
-            parsed_json = json.loads(json_str)
-            
-            # 检查是否为字典类型
-            if not isinstance(parsed_json, dict):
-                return False
-            
-            # 检查是否包含必要的字段
-            if 'name' not in parsed_json:
-                return False
-            
-            # 检查name字段是否为字符串且不为空
-            if not isinstance(parsed_json['name'], str) or not parsed_json['name'].strip():
-                return False
-            
-            # 检查arguments字段（如果存在）
-            if 'arguments' in parsed_json:
-                if not isinstance(parsed_json['arguments'], dict):
-                    return False
-            
-            return True
-            
-        except (json.JSONDecodeError, TypeError, KeyError):
-            return False
+    # 工具调用格式校验与工具执行模拟器共用同一实现
+    _is_valid_tool_call_json = staticmethod(is_valid_tool_call_json)
 
 if __name__ == "__main__":
     # 注意拼写：AgentSimulator
@@ -5,7 +5,7 @@ Agent合成模块
 
 from .tool_graph import ToolGraph
 from .tool_combination_generator import ToolCombinationGenerator
-from .agent_config_generator import AgentConfigGenerator
+from .agent_config_generator import AgentConfigGenerator, build_tool_table
 
 from core.base_module import BaseModule
 from typing import Dict, Any, List
@@ -69,26 +69,35 @@ class AgentSynthesizerModule(BaseModule):
                 'target_count': target_agent_count
             })
             
-            # 2. 创建工具数据映射
-            tools_data = {tool['id']: tool for tool in tools}
+            # 2. 创建工具表（每个工具只序列化一次，生成配置时按ID直接取用）
+            tool_table = build_tool_table({tool['id']: tool for tool in tools})
             
             # 3. 生成智能体配置
             agents = self.agent_config_generator.process({
                 'tool_combinations': tool_combinations,
-                'tools_data': tools_data
+                'tool_table': tool_table
             })
             
             self.logger.info(f"Successfully generated {len(agents)} agent configurations")
             
+            # 单次遍历统计工具总数和去重工具集合
+            combination_count = len(tool_combinations)
+            total_tools = 0
+            unique_tools = set()
+            for combo in tool_combinations:
+                tool_ids = combo['tool_ids']
+                total_tools += len(tool_ids)
+                unique_tools.update(tool_ids)
+            
             return {
                 'agents': agents,
                 'tool_combinations': tool_combinations,
                 'stats': {
                     'agent_count': len(agents),
-                    'tool_combinations_count': len(tool_combinations),
-                    'avg_tools_per_agent': sum(len(combo['tool_ids']) for combo in tool_combinations) / len(tool_combinations) if tool_combinations else 0,
-                    'unique_tools_used': len(set(tool_id for combo in tool_combinations for tool_id in combo['tool_ids'])),
-                    'agent_generation_success_rate': len(agents) / len(tool_combinations) if tool_combinations else 0,
+                    'tool_combinations_count': combination_count,
+                    'avg_tools_per_agent': total_tools / combination_count if combination_count else 0,
+                    'unique_tools_used': len(unique_tools),
+                    'agent_generation_success_rate': len(agents) / combination_count if combination_count else 0,
                     'generation_method': 'fixed_template_simple'
                 }
             }
@@ -4,7 +4,7 @@
 """
 
 import random
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import logging
 from datetime import datetime
 
@@ -14,10 +14,79 @@ from core.exceptions import AgentDataGenException
 from utils.data_processor import DataProcessor
 from utils.file_manager import FileManager
 
+# 工具表条目：(name, description, 序列化后的JSON Schema工具定义)
+ToolEntry = Tuple[str, str, str]
+_SCHEMA = 2
+
+
+def _format_tool_schema(tool: Dict[str, Any]) -> str:
+    """将单个工具转换为JSON Schema格式的工具定义并序列化（键排序的紧凑JSON）"""
+    from config.prompts import format_tools
+    
+    tool_name = tool.get('name', '')
+    tool_desc = tool.get('description', '')
+    parameters = tool.get('parameters', [])
+    
+    # 构建JSON Schema格式的工具定义
+    tool_json = {
+        "name": tool_name,
+        "description": tool_desc,
+        "parameters": {
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    }
+    
+    # 处理参数
+    for param in parameters:
+        param_name = param.get('name', '')
+        param_type = param.get('type', 'string')
+        param_desc = param.get('description', '')
+        required = param.get('required', False)
+        enum_values = param.get('enum', None)
+        
+        # 构建参数定义
+        param_def = {
+            "type": param_type,
+            "description": param_desc
+        }
+        
+        # 添加枚举值（如果有）
+        if enum_values:
+            param_def["enum"] = enum_values
+        
+        # 添加到properties
+        tool_json["parameters"]["properties"][param_name] = param_def
+        
+        # 添加到required（如果是必填）
+        if required:
+            tool_json["parameters"]["required"].append(param_name)
+    
+    return format_tools(tool_json)
+
+
+def build_tool_table(tools_data: Dict[str, Dict[str, Any]]) -> Dict[str, ToolEntry]:
+    """
+    将工具数据一次性整理为扁平的工具表，每个工具只序列化一次
+    
+    Args:
+        tools_data: 工具ID到工具字典的映射
+        
+    Returns:
+        工具ID到 (name, description, schema_json) 元组的映射
+    """
+    return {
+        tool_id: (tool.get('name', ''), tool.get('description', ''), _format_tool_schema(tool))
+        for tool_id, tool in tools_data.items()
+    }
+
 
 class AgentConfigGenerator(BaseModule):
     """智能体配置生成器"""
     
+    __slots__ = ('data_processor', 'file_manager', '_prompt_cache')
+    
     def __init__(self, config: Dict[str, Any] = None, logger: logging.Logger = None):
         """
         初始化智能体配置生成器
@@ -30,6 +99,8 @@ class AgentConfigGenerator(BaseModule):
         
         self.data_processor = None
         self.file_manager = None
+        # 工具ID序列 -> 系统提示词（工具集相同的智能体共享同一提示词）
+        self._prompt_cache: Dict[Tuple[str, ...], str] = {}
         
     def _setup(self):
         """设置组件"""
@@ -55,17 +126,22 @@ class AgentConfigGenerator(BaseModule):
         """
         try:
             tool_combinations = input_data.get('tool_combinations', [])
-            tools_data = input_data.get('tools_data', {})
+            tool_table = input_data.get('tool_table')
+            if tool_table is None:
+                tool_table = build_tool_table(input_data.get('tools_data', {}))
+            # 提示词缓存只对同一份工具表有效
+            self._prompt_cache.clear()
             
             if not tool_combinations:
                 raise AgentDataGenException("No tool combinations provided")
             
             self.logger.info(f"Generating agent configurations for {len(tool_combinations)} combinations")
             
+            # 工具定义已预序列化、提示词按工具集缓存，每个组合的工作量很小，串行生成即可
             agents = []
             for i, combination in enumerate(tool_combinations):
                 try:
-                    agent = self._generate_agent_config(combination, tools_data)
+                    agent = self._generate_agent_config(combination, tool_table)
                     if agent:
                         agents.append(agent)
                         
@@ -84,7 +160,7 @@ class AgentConfigGenerator(BaseModule):
             raise AgentDataGenException(f"Failed to generate agent configurations: {e}")
     
     def _generate_agent_config(self, combination: Dict[str, Any], 
-                                     tools_data: Dict[str, Any]) -> Optional[AgentConfig]:
+                                     tool_table: Dict[str, ToolEntry]) -> Optional[AgentConfig]:
         """生成单个智能体配置"""
         
         try:
@@ -97,7 +173,7 @@ class AgentConfigGenerator(BaseModule):
                 raise ValueError("No tools in combination")
             
             # 3. 生成系统提示词
-            system_prompt = self._build_system_prompt_with_tools(tool_ids, tools_data)
+            system_prompt = self._build_system_prompt_with_tools(tool_ids, tool_table)
             # 4. 创建AgentConfig对象
             agent_config = AgentConfig(
                 id=agent_id,
@@ -111,99 +187,50 @@ class AgentConfigGenerator(BaseModule):
             self.logger.error(f"Failed to generate agent config: {e}")
             return None
     
-    def _build_system_prompt_with_tools(self, tool_ids: List[str], tools_data: Dict[str, Any]) -> str:
+    def _build_system_prompt_with_tools(self, tool_ids: List[str], tool_table: Dict[str, ToolEntry]) -> str:
         """构建包含工具列表的系统提示词"""
         from config.prompts.agent_prompts import AgentPrompts
+        from config.prompts._blocks import join_blocks
         
-        # 获取工具详细信息
-        tools_info = []
-        for tool_id in tool_ids:
-            if tool_id in tools_data:
-                tools_info.append(tools_data[tool_id])
+        # 按工具顺序缓存（顺序决定提示词中工具的排列，不能排序后再做键）
+        key = tuple(tool_ids)
+        system_prompt = self._prompt_cache.get(key)
+        if system_prompt is not None:
+            return system_prompt
         
-        # 构建工具列表文本
-        tools_list = self._build_tools_list(tools_info)
+        # 构建工具列表文本（每行一个工具，直接取预序列化的工具定义）
+        tools_list = '\n'.join(
+            tool_table[tool_id][_SCHEMA] for tool_id in tool_ids if tool_id in tool_table
+        )
         
-        # 使用固定模板
-        prompts = AgentPrompts()
-        return prompts.AGENT_SYSTEM.format(tools_list=tools_list)
-    
-    def _build_tools_list(self, tools_info: List[Dict[str, Any]]) -> str:
-        """构建JSON格式的工具列表"""
-        import json
-        
-        tools_json_list = []
-        
-        for tool in tools_info:
-            tool_name = tool.get('name', '')
-            tool_desc = tool.get('description', '')
-            parameters = tool.get('parameters', [])
-            
-            # 构建JSON Schema格式的工具定义
-            tool_json = {
-                "name": tool_name,
-                "description": tool_desc,
-                "parameters": {
-                    "type": "object",
-                    "properties": {},
-                    "required": []
-                }
-            }
-            
-            # 处理参数
-            for param in parameters:
-                param_name = param.get('name', '')
-                param_type = param.get('type', 'string')
-                param_desc = param.get('description', '')
-                required = param.get('required', False)
-                enum_values = param.get('enum', None)
-                
-                # 构建参数定义
-                param_def = {
-                    "type": param_type,
-                    "description": param_desc
-                }
-                
-                # 添加枚举值（如果有）
-                if enum_values:
-                    param_def["enum"] = enum_values
-                
-                # 添加到properties
-                tool_json["parameters"]["properties"][param_name] = param_def
-                
-                # 添加到required（如果是必填）
-                if required:
-                    tool_json["parameters"]["required"].append(param_name)
-            
-            # 格式化JSON并添加到列表
-            tool_json_str = json.dumps(tool_json, ensure_ascii=False, indent=2)
-            tools_json_list.append(tool_json_str)
-        
-        return '\n\n'.join(tools_json_list)
-
+        # 使用固定模板（静态前缀在前，工具列表在尾部，持久化为纯文本）
+        system_prompt = self._prompt_cache[key] = join_blocks(AgentPrompts.build_agent_system(tools_list))
+        return system_prompt
     
     def _save_agent_configs(self, agents: List[AgentConfig]):
         """保存智能体配置"""
         try:
-            # 转换为可序列化的格式
-            agents_data = []
-            for agent in agents:
-                agent_dict = {
+            # 缺少创建时间的智能体统一使用本次保存的时间
+            now = datetime.now()
+            now_iso = now.isoformat()
+            
+            # 逐个转换为可序列化的格式（生成器，不构建完整列表）
+            agents_data = (
+                {
                     'id': agent.id,
                     'system_prompt': agent.system_prompt,
                     'tools': agent.tools,
-                    'created_at': agent.created_at.isoformat() if hasattr(agent, 'created_at') and agent.created_at else datetime.now().isoformat()
+                    'created_at': agent.created_at.isoformat() if hasattr(agent, 'created_at') and agent.created_at else now_iso
                 }
-                agents_data.append(agent_dict)
+                for agent in agents
+            )
             
-            # 保存主文件
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            # 保存主文件（流式写入JSON数组）
+            timestamp = now.strftime("%Y%m%d_%H%M%S")
             filename = f"agents_batch_{timestamp}.json"
             
-            self.file_manager.save_json(agents_data, filename)
+            self.file_manager.save_json_array(agents_data, filename)
             
         except Exception as e:
             self.logger.error(f"Failed to save agent configs: {e}")
             raise AgentDataGenException(f"Failed to save agents: {e}")
-
-    
@@ -0,0 +1,277 @@
+"""
+场景工具图的紧凑表示
+将单个场景的 networkx 工具图压缩为节点列表 + CSR邻接数组 + 别名采样表，
+组合生成阶段的随机游走只读这些扁平结构，不再经过 networkx 的 dict-of-dict
+安装 numba 时整批游走在编译后的内核中完成；未安装时使用纯Python别名采样
+"""
+
+import heapq
+import random
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+from networkx.utils import reverse_cuthill_mckee_ordering
+
+try:
+    from numba import njit
+except ImportError:  # 未安装 numba 时使用纯Python游走
+    njit = None
+
+HAS_NUMBA = njit is not None
+
+
+def _build_alias_table(weights: List[float]) -> Tuple[List[float], List[int]]:
+    """
+    Vose 别名方法：O(n) 构建 (prob, alias) 表，之后每次加权采样为 O(1)
+    权重总和为0时退化为均匀分布（与 ToolGraph._weighted_random_choice 一致）
+    """
+    n = len(weights)
+    total = sum(weights)
+    if total <= 0:
+        return [1.0] * n, list(range(n))
+
+    scaled = [w * n / total for w in weights]
+    prob = [1.0] * n
+    alias = list(range(n))
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+    while small and large:
+        s = small.pop()
+        l = large.pop()
+        prob[s] = scaled[s]
+        alias[s] = l
+        scaled[l] = scaled[l] + scaled[s] - 1.0
+        (small if scaled[l] < 1.0 else large).append(l)
+
+    # 剩余项（含浮点误差）概率为1
+    return prob, alias
+
+
+def _random_walks(indptr, indices, cum_weights, starts, counts,
+                  walk_length, restart_prob, seed, out, filled):
+    """
+    批量执行带重启的加权随机游走（语义与 ToolGraph.random_walk_selection 相同）
+
+    每个游走按首次访问顺序把不重复的节点（含起点）写入 out[w]，
+    收集满 counts[w] 个或走满 walk_length * counts[w] 步后停止，实际数量写入 filled[w]
+    """
+    np.random.seed(seed)
+    for w in range(starts.shape[0]):
+        start = starts[w]
+        target = counts[w]
+        node = start
+        n_filled = 0
+        for _ in range(walk_length * target):
+            if n_filled >= target:
+                break
+
+            # 记录当前节点（游走很短，行内线性查重即可）
+            seen = False
+            for k in range(n_filled):
+                if out[w, k] == node:
+                    seen = True
+                    break
+            if not seen:
+                out[w, n_filled] = node
+                n_filled += 1
+
+            # 决定是否重启
+            if np.random.random() < restart_prob:
+                node = start
+                continue
+
+            # 没有邻居时回到起点
+            lo = indptr[node]
+            hi = indptr[node + 1]
+            if hi == lo:
+                node = start
+                continue
+
+            # 按累积权重选择邻居，权重总和为0时均匀选择
+            total = cum_weights[hi - 1]
+            if total <= 0.0:
+                node = indices[lo + min(int(np.random.random() * (hi - lo)), hi - lo - 1)]
+                continue
+            r = np.random.random() * total
+            j = lo
+            while j < hi - 1 and cum_weights[j] <= r:
+                j += 1
+            node = indices[j]
+        filled[w] = n_filled
+
+
+if HAS_NUMBA:
+    _random_walks = njit(cache=True, nogil=True)(_random_walks)
+
+# numba 内核使用的数组：(indptr, indices, 行内累积权重)
+KernelArrays = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+@dataclass(slots=True)
+class ScenarioGraph:
+    """单个场景工具图的只读紧凑表示（节点以下标表示，邻接为CSR布局）"""
+    nodes: List[str]
+    name_to_idx: Dict[str, int]
+    indptr: List[int]
+    indices: List[int]
+    weights: List[float]
+    # 别名表与 indices 对齐，alias_idx 为 indices 中的绝对位置
+    alias_prob: List[float]
+    alias_idx: List[int]
+    walk_length: int = 6
+    restart_probability: float = 0.15
+    kernel_arrays: Optional[KernelArrays] = None
+
+    @classmethod
+    def from_graph(cls, graph: nx.Graph, walk_length: int = 6, restart_probability: float = 0.15,
+                   default_weight: float = 0.5, reorder: bool = True) -> "ScenarioGraph":
+        """
+        从 networkx 图构建（每行邻居顺序与 graph.neighbors 相同）
+
+        Args:
+            graph: networkx 工具图
+            walk_length: 最大步数系数，每个游走最多走 walk_length * count 步
+            restart_probability: 每步回到起点的概率
+            default_weight: 边未设置 weight 时使用的权重
+            reorder: 是否按 Reverse Cuthill-McKee 顺序编号节点，使相邻节点的下标彼此接近，
+                游走和邻居查询访问的数组位置更集中（只改变内存布局，不改变游走分布）
+        """
+        nodes = list(reverse_cuthill_mckee_ordering(graph)) if reorder else list(graph.nodes())
+        name_to_idx = {node: i for i, node in enumerate(nodes)}
+
+        indptr = [0]
+        indices = []
+        weights = []
+        alias_prob = []
+        alias_idx = []
+        for node in nodes:
+            lo = len(indices)
+            row_weights = []
+            for neighbor, edge_data in graph.adj[node].items():
+                indices.append(name_to_idx[neighbor])
+                row_weights.append(edge_data.get('weight', default_weight))
+            if row_weights:
+                prob, alias = _build_alias_table(row_weights)
+                weights.extend(row_weights)
+                alias_prob.extend(prob)
+                alias_idx.extend(lo + a for a in alias)
+            indptr.append(len(indices))
+
+        kernel_arrays = None
+        if HAS_NUMBA:
+            indptr_arr = np.asarray(indptr, dtype=np.int32)
+            # 整体做一次前缀和，再减去每行起点之前的累计值，得到行内累积权重
+            # （全零权重的行相减后严格为0，内核据此退化为均匀选择）
+            cum_weights = np.cumsum(np.asarray(weights, dtype=np.float64))
+            row_offsets = np.concatenate(([0.0], cum_weights))[indptr_arr[:-1]]
+            cum_weights -= np.repeat(row_offsets, np.diff(indptr_arr))
+            kernel_arrays = (indptr_arr, np.asarray(indices, dtype=np.int32), cum_weights)
+
+        return cls(nodes, name_to_idx, indptr, indices, weights, alias_prob, alias_idx,
+                   walk_length, restart_probability, kernel_arrays)
+
+    def number_of_nodes(self) -> int:
+        return len(self.nodes)
+
+    def number_of_edges(self) -> int:
+        return len(self.indices) // 2
+
+    def get_related_tools(self, tool_id: str, max_count: int) -> List[str]:
+        """按边权重从高到低返回直接邻居（与 ToolGraph.get_related_tools 相同）"""
+        node = self.name_to_idx.get(tool_id)
+        if node is None:
+            return []
+        lo, hi = self.indptr[node], self.indptr[node + 1]
+        # 只取前 max_count 个，不对整行排序（结果与 sorted(..., reverse=True)[:max_count] 相同）
+        top = heapq.nlargest(max_count, range(lo, hi), key=self.weights.__getitem__)
+        return [self.nodes[self.indices[j]] for j in top]
+
+    def random_walk_batch(self, start_tools: List[str], counts: List[int],
+                          restart_prob: float = None) -> List[List[str]]:
+        """
+        批量随机游走，每个结果与 ToolGraph.random_walk_selection 同分布
+
+        Args:
+            start_tools: 起始工具ID列表
+            counts: 每个起始工具需要选择的工具数量
+            restart_prob: 重启概率
+
+        Returns:
+            与 start_tools 一一对应的选中工具ID列表，不含起始工具且最多 count 个
+            （不在图中的起点对应空列表）
+        """
+        restart_prob = restart_prob or self.restart_probability
+        results: List[List[str]] = [[] for _ in start_tools]
+        valid = [i for i, start_tool in enumerate(start_tools) if start_tool in self.name_to_idx]
+        if not valid:
+            return results
+
+        starts = [self.name_to_idx[start_tools[i]] for i in valid]
+        valid_counts = [counts[i] for i in valid]
+        if self.kernel_arrays is not None:
+            walks = self._kernel_walks(starts, valid_counts, restart_prob)
+        else:
+            walks = [self._walk(start, count, restart_prob) for start, count in zip(starts, valid_counts)]
+
+        nodes = self.nodes
+        for i, start, walk in zip(valid, starts, walks):
+            selected_tools = [nodes[node] for node in walk if node != start]
+
+            # 如果选择的工具不够，补充最相似的工具
+            count = counts[i]
+            if len(selected_tools) < count:
+                selected_set = set(selected_tools)
+                for tool in self.get_related_tools(nodes[start], count - len(selected_tools)):
+                    if tool not in selected_set:
+                        selected_tools.append(tool)
+                        selected_set.add(tool)
+
+            results[i] = selected_tools[:count]
+        return results
+
+    def _walk(self, start: int, count: int, restart_prob: float) -> List[int]:
+        """单次纯Python游走，返回按首次访问顺序收集的节点下标（含起点）"""
+        indptr, indices = self.indptr, self.indices
+        alias_prob, alias_idx = self.alias_prob, self.alias_idx
+        rand = random.random
+
+        visited = []
+        seen = set()
+        node = start
+        for _ in range(self.walk_length * count):
+            if len(visited) >= count:
+                break
+
+            if node not in seen:
+                seen.add(node)
+                visited.append(node)
+
+            # 决定是否重启
+            if rand() < restart_prob:
+                node = start
+                continue
+
+            # 没有邻居时回到起点，否则别名表 O(1) 采样
+            lo, hi = indptr[node], indptr[node + 1]
+            if hi == lo:
+                node = start
+                continue
+            j = lo + int(rand() * (hi - lo))
+            node = indices[j] if rand() < alias_prob[j] else indices[alias_idx[j]]
+
+        return visited
+
+    def _kernel_walks(self, starts: List[int], counts: List[int], restart_prob: float) -> List[List[int]]:
+        """在 numba 内核中一次完成整批游走"""
+        indptr, indices, cum_weights = self.kernel_arrays
+        counts_arr = np.asarray(counts, dtype=np.int32)
+        out = np.full((len(starts), max(int(counts_arr.max()), 1)), -1, dtype=np.int32)
+        filled = np.zeros(len(starts), dtype=np.int32)
+
+        _random_walks(indptr, indices, cum_weights, np.asarray(starts, dtype=np.int32), counts_arr,
+                      int(self.walk_length), float(restart_prob), random.getrandbits(32), out, filled)
+
+        return [row[:n] for row, n in zip(out.tolist(), filled.tolist())]
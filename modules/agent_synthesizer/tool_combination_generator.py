@@ -3,16 +3,27 @@
 基于场景内工具的相似度构建图，通过随机游走生成工具组合
 """
 
+import hashlib
+import itertools
 import random
-from typing import Dict, Any, List, Tuple, Set
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple, Set
 import logging
 from datetime import datetime
 from collections import defaultdict
 
+import numpy as np
+
 from core.base_module import BaseModule
 from core.exceptions import AgentDataGenException
 from utils.data_processor import DataProcessor
 from .tool_graph import ToolGraph
+from .scenario_graph import ScenarioGraph
+
+# 显式配置 max_workers > 1 且有效场景数达到该值时才启用进程池（进程启动开销需要足够多的场景摊销）
+_PARALLEL_MIN_SCENARIOS = 4
+# 各场景的工具数差异大、耗时不均，逐个分发以平衡负载
+_PARALLEL_CHUNKSIZE = 1
 
 
 class ToolCombinationGenerator(BaseModule):
@@ -39,6 +50,7 @@ class ToolCombinationGenerator(BaseModule):
         # 场景分布配置
         self.scenario_sampling_weights = {}  # scenario_id -> weight
         self.max_agents_per_scenario = 50   # 每个场景最多生成的智能体数量
+        self.max_workers = 1
         
     def _setup(self):
         """设置组件"""
@@ -58,6 +70,10 @@ class ToolCombinationGenerator(BaseModule):
         tools_per_agent = agent_config.get('tools_per_agent', {})
         self.min_tools_per_agent = tools_per_agent.get('min', 3)
         self.max_tools_per_agent = tools_per_agent.get('max', 6)
+        
+        # 各场景的建图与随机游走互不依赖，可通过 max_workers 启用进程池；
+        # 常见规模下单个场景耗时很短，进程启动与数据传输开销高于收益，默认串行
+        self.max_workers = self.config.get('max_workers', 1)
     
     def process(self, input_data: Dict[str, Any], **kwargs) -> List[Dict[str, Any]]:
         """
@@ -79,21 +95,30 @@ class ToolCombinationGenerator(BaseModule):
             
             self.logger.info(f"Generating {target_count} tool combinations from {len(tools)} tools")
             
+            # 同一批生成的组合共用一个时间戳
+            generated_at = datetime.now().isoformat()
+            
             # 1. 按场景分组工具
             scenario_groups = self._group_tools_by_scenario(tools)
             self.logger.info(f"Found {len(scenario_groups)} scenario groups")
             
-            # 2. 为每个场景构建工具图
-            scenario_graphs = self._build_scenario_graphs(scenario_groups)
-            
-            target_count_per_scenario = target_count // len(scenario_graphs)
-            # 3. 生成工具组合
-            combinations = self._generate_combinations_from_scenarios(
-                scenario_graphs, target_count_per_scenario
-            )
+            # 2-3. 组合以生成器逐个产出，去重时边生成边收集
+            if self.max_workers > 1 and len(scenario_groups) >= _PARALLEL_MIN_SCENARIOS:
+                # 每个工作进程独立完成单个场景的建图与组合生成，图对象不跨进程传输
+                combinations = self._generate_combinations_in_pool(
+                    scenario_groups, target_count, generated_at
+                )
+            else:
+                # 2. 为每个场景构建工具图
+                scenario_graphs = self._build_scenario_graphs(scenario_groups)
+                
+                # 3. 生成工具组合
+                combinations = self._generate_combinations_from_scenarios(
+                    scenario_graphs, target_count, generated_at
+                )
             
-            # 4. 去重和验证
-            unique_combinations = self._deduplicate_combinations(combinations)
+            # 4. 在线去重，收集满目标数量后停止
+            unique_combinations = self._deduplicate_combinations(combinations, target_count)
             
             self.logger.info(f"Generated {len(unique_combinations)} unique tool combinations")
             return unique_combinations
@@ -105,77 +130,118 @@ class ToolCombinationGenerator(BaseModule):
     def _group_tools_by_scenario(self, tools: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
         """按场景分组工具"""
         scenario_groups = defaultdict(list)
-        no_scenario_tools = []
         
         for tool in tools:
-            scenario_ids = tool.get('scenario_ids', [])
+            scenario_ids = tool.get('scenario_ids')
             
+            # 工具可能属于多个场景，选择第一个作为主场景；无场景的工具不参与组合
             if scenario_ids:
-                # 工具可能属于多个场景，选择第一个作为主场景
-                primary_scenario = scenario_ids[0]
-                scenario_groups[primary_scenario].append(tool)
-                
-            else:
-                no_scenario_tools.append(tool)
+                scenario_groups[scenario_ids[0]].append(tool)
         
         # 过滤掉工具数量太少的场景
+        min_tools = self.min_tools_per_agent
         filtered_groups = {
             scenario_id: tools_list 
             for scenario_id, tools_list in scenario_groups.items()
-            if len(tools_list) >= self.min_tools_per_agent
+            if len(tools_list) >= min_tools
         }
         
         self.logger.info(f"Scenario grouping: {len(filtered_groups)} valid scenarios")
-        for scenario_id, tools_list in filtered_groups.items():
-            self.logger.debug(f"  {scenario_id}: {len(tools_list)} tools")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            for scenario_id, tools_list in filtered_groups.items():
+                self.logger.debug("  %s: %d tools", scenario_id, len(tools_list))
         
         return filtered_groups
     
-    def _build_scenario_graphs(self, scenario_groups: Dict[str, List[Dict[str, Any]]]) -> Dict[str, ToolGraph]:
+    def _build_scenario_graphs(self, scenario_groups: Dict[str, List[Dict[str, Any]]]) -> Dict[str, ScenarioGraph]:
         """为每个场景构建工具图"""
         scenario_graphs = {}
         
         for scenario_id, tools_list in scenario_groups.items():
-            try:
-                # 创建新的工具图实例
-                graph = ToolGraph(logger=self.logger)
-                graph.initialize()
-                
-                # 构建图
-                graph.process({'tools': tools_list})
-                
+            graph = self._build_scenario_graph(scenario_id, tools_list)
+            if graph is not None:
                 scenario_graphs[scenario_id] = graph
-                
-                self.logger.debug(f"Built graph for scenario {scenario_id}: "
-                                f"{graph.graph.number_of_nodes()} nodes, "
-                                f"{graph.graph.number_of_edges()} edges")
-                
-            except Exception as e:
-                self.logger.error(f"Failed to build graph for scenario {scenario_id}: {e}")
-                continue
         
         return scenario_graphs
     
-    def _generate_combinations_from_scenarios(self, scenario_graphs: Dict[str, ToolGraph], 
-                                            target_count: int) -> List[Dict[str, Any]]:
-        """从各场景生成工具组合"""
-        combinations = []
+    def _build_scenario_graph(self, scenario_id: str, tools_list: List[Dict[str, Any]]) -> Optional[ScenarioGraph]:
+        """为单个场景构建工具图并压缩为 ScenarioGraph，失败时返回 None"""
+        try:
+            # 复用 _setup 中初始化的工具图实例，只清空图数据
+            graph = self.tool_graph
+            graph.reset()
+            
+            # 构建图；紧凑表示与 networkx 图相互独立，reset 后仍可继续使用
+            graph.process({'tools': tools_list})
+            scenario_graph = graph.compact_graph
+            
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Built graph for scenario %s: %d nodes, %d edges",
+                                  scenario_id, scenario_graph.number_of_nodes(),
+                                  scenario_graph.number_of_edges())
+            return scenario_graph
+            
+        except Exception as e:
+            self.logger.error(f"Failed to build graph for scenario {scenario_id}: {e}")
+            return None
+    
+    def _generate_combinations_in_pool(self, scenario_groups: Dict[str, List[Dict[str, Any]]],
+                                       target_count: int, generated_at: str) -> Iterator[Dict[str, Any]]:
+        """使用进程池按场景并行建图，按场景顺序逐个产出工具组合（target_count 为所有场景的总数）"""
+        quotas = self._allocate_scenario_quotas(list(scenario_groups), target_count)
+        
+        # 子进程会复制父进程的随机数状态，按 (本次运行的种子, 场景ID) 为每个场景单独播种，
+        # 避免各进程产生相同的随机序列，父进程播种后结果也可复现
+        run_seed = random.getrandbits(64)
+        tasks = [
+            (scenario_id, scenario_groups[scenario_id], quota, f"{run_seed}:{scenario_id}", generated_at)
+            for scenario_id, quota in quotas.items()
+        ]
+        
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(self.config,)
+        ) as executor:
+            for scenario_combinations in executor.map(
+                _generate_scenario_in_worker, tasks, chunksize=_PARALLEL_CHUNKSIZE
+            ):
+                yield from scenario_combinations
+    
+    def _generate_combinations_from_scenarios(self, scenario_graphs: Dict[str, ScenarioGraph], 
+                                            target_count: int, generated_at: str = None) -> Iterator[Dict[str, Any]]:
+        """从各场景逐个产出工具组合（target_count 为所有场景的总数）"""
+        quotas = self._allocate_scenario_quotas(list(scenario_graphs), target_count)
         
         # # 计算每个场景应该生成的组合数量
         # scenario_allocation = self._allocate_combinations_to_scenarios(
         #     scenario_graphs, target_count
         # )
         
-        for scenario_id, graph in scenario_graphs.items():
-            target_for_scenario = target_count
-                        
-            scenario_combinations = self._generate_combinations_for_scenario(
-                scenario_id, graph, target_for_scenario
+        for scenario_id, target_for_scenario in quotas.items():
+            yield from self._generate_combinations_for_scenario(
+                scenario_id, scenario_graphs[scenario_id], target_for_scenario, generated_at
             )
-            
-            combinations.extend(scenario_combinations)
+    
+    def _allocate_scenario_quotas(self, scenario_ids: List[str], target_count: int) -> Dict[str, int]:
+        """
+        将总目标数均分到各场景，余数依次分给前面的场景，配额为0的场景不参与生成
+        
+        Args:
+            scenario_ids: 场景ID列表
+            target_count: 所有场景的组合总数
+        """
+        if not scenario_ids:
+            self.logger.warning("No valid scenario graphs to generate combinations from")
+            return {}
         
-        return combinations
+        per_scenario, extra = divmod(target_count, len(scenario_ids))
+        quotas = {}
+        for i, scenario_id in enumerate(scenario_ids):
+            quota = per_scenario + (1 if i < extra else 0)
+            if quota > 0:
+                quotas[scenario_id] = quota
+        return quotas
     
     # def _allocate_combinations_to_scenarios(self, scenario_graphs: Dict[str, ToolGraph], 
     #                                       target_count: int) -> Dict[str, int]:
@@ -223,15 +289,14 @@ class ToolCombinationGenerator(BaseModule):
         
     #     return allocation
     
-    def _generate_combinations_for_scenario(self, scenario_id: str, graph: ToolGraph, 
-                                          target_count: int) -> List[Dict[str, Any]]:
-        """为单个场景生成工具组合"""
-        combinations = []
-        available_tools = list(graph.graph.nodes())
+    def _generate_combinations_for_scenario(self, scenario_id: str, graph: ScenarioGraph, 
+                                          target_count: int, generated_at: str = None) -> Iterator[Dict[str, Any]]:
+        """为单个场景生成工具组合（惰性产出）"""
+        available_tools = graph.nodes
         
         if len(available_tools) < self.min_tools_per_agent:
             self.logger.warning(f"Scenario {scenario_id} has too few tools: {len(available_tools)}")
-            return combinations
+            return iter(())
         
         # 使用多种策略生成组合
         # strategies = [
@@ -245,7 +310,7 @@ class ToolCombinationGenerator(BaseModule):
             
         #     if strategy == 'random_walk':
         combinations = self._generate_random_walk_combinations(
-            scenario_id, graph, target_count
+            scenario_id, graph, target_count, available_tools, generated_at
         )
             # elif strategy == 'cluster_based':
             #     strategy_combinations = self._generate_cluster_based_combinations(
@@ -256,45 +321,56 @@ class ToolCombinationGenerator(BaseModule):
             #         scenario_id, available_tools, strategy_count
             #     )
         
-        return combinations[:target_count]
+        return itertools.islice(combinations, target_count)
     
-    def _generate_random_walk_combinations(self, scenario_id: str, graph: ToolGraph, 
-                                         count: int) -> List[Dict[str, Any]]:
-        """使用随机游走生成组合"""
-        combinations = []
-        available_tools = list(graph.graph.nodes())
-        
-        for i in range(count):
-            # 随机选择起始工具
-            start_tool = random.choice(available_tools)
-            
-            # 确定组合大小
-            combo_size = random.randint(self.min_tools_per_agent, self.max_tools_per_agent)
-            
-            # 执行随机游走
-            selected_tools = graph.random_walk_selection(start_tool, combo_size - 1)
-            
-            # 确保包含起始工具
-            if start_tool not in selected_tools:
-                selected_tools.insert(0, start_tool)
-            
-            # 限制大小
-            selected_tools = selected_tools[:combo_size]
+    def _generate_random_walk_combinations(self, scenario_id: str, graph: ScenarioGraph, 
+                                         count: int, available_tools: List[str] = None,
+                                         generated_at: str = None) -> Iterator[Dict[str, Any]]:
+        """使用随机游走生成组合（生成器，组合记录在被取用时才创建）"""
+        generated_at = generated_at or datetime.now().isoformat()
+        if available_tools is None:
+            available_tools = graph.nodes
+        
+        # 一次性批量生成所有起始工具下标与组合大小（以 random 派生种子，随全局播种可复现）
+        rng = np.random.default_rng(random.getrandbits(64))
+        start_indices = rng.integers(0, len(available_tools), size=count).tolist()
+        combo_sizes = rng.integers(
+            self.min_tools_per_agent, self.max_tools_per_agent + 1, size=count
+        ).tolist()
+        
+        start_tools = [available_tools[i] for i in start_indices]
+        
+        # 批量执行随机游走
+        walks = graph.random_walk_batch(start_tools, [size - 1 for size in combo_sizes])
+        # 场景内已生成组合的签名，重复组合在生成ID前跳过
+        seen_signatures = set()
+        
+        for start_tool, walk in zip(start_tools, walks):
+            # 游走结果不含起始工具且最多 combo_size - 1 个，起始工具放在最前即得到完整组合，
+            # 无需成员检查、insert(0) 移位和截断
+            selected_tools = [start_tool, *walk]
             
-            # 如果工具数量不足，随机补充
-            while len(selected_tools) < self.min_tools_per_agent:
-                remaining_tools = [t for t in available_tools if t not in selected_tools]
-                if not remaining_tools:
-                    break
-                selected_tools.append(random.choice(remaining_tools))
+            # 如果工具数量不足，随机补充：从全部工具中无放回抽取 need + 已选数量 个，
+            # 去掉已选的后至少剩 need 个，一次 random.sample 即可，无需构建剩余工具集合
+            need = self.min_tools_per_agent - len(selected_tools)
+            if need > 0:
+                selected_set = set(selected_tools)
+                sample_size = min(need + len(selected_tools), len(available_tools))
+                extra_tools = [
+                    tool for tool in random.sample(available_tools, sample_size)
+                    if tool not in selected_set
+                ]
+                selected_tools.extend(extra_tools[:need])
             
             if len(selected_tools) >= self.min_tools_per_agent:
-                combination = self._create_combination_record(
-                    scenario_id, selected_tools, 'random_walk', start_tool
+                signature = frozenset(selected_tools)
+                if signature in seen_signatures:
+                    continue
+                seen_signatures.add(signature)
+                
+                yield self._create_combination_record(
+                    scenario_id, selected_tools, 'random_walk', start_tool, generated_at
                 )
-                combinations.append(combination)
-        
-        return combinations
     
     # def _generate_cluster_based_combinations(self, scenario_id: str, graph: ToolGraph, 
     #                                        count: int) -> List[Dict[str, Any]]:
@@ -337,13 +413,18 @@ class ToolCombinationGenerator(BaseModule):
     #     return combinations
     
     def _create_combination_record(self, scenario_id: str, tool_ids: List[str], 
-                                 method: str, start_tool: str) -> Dict[str, Any]:
+                                 method: str, start_tool: str, generated_at: str = None) -> Dict[str, Any]:
         """创建组合记录"""
-        combination_id = self.data_processor.generate_id('combination', {
-            'scenario': scenario_id,
-            'tools': sorted(tool_ids),
-            'timestamp': datetime.now().isoformat()
-        })
+        generated_at = generated_at or datetime.now().isoformat()
+        # 直接对 (场景, 排序后的工具ID, 时间戳) 做 blake2b 摘要，不经过JSON序列化
+        h = hashlib.blake2b(digest_size=16)
+        h.update(scenario_id.encode())
+        for tool_id in sorted(tool_ids):
+            h.update(b'\0')
+            h.update(tool_id.encode())
+        h.update(b'\1')
+        h.update(generated_at.encode())
+        combination_id = f"combination_{h.hexdigest()}"
         
         return {
             'id': combination_id,
@@ -353,24 +434,33 @@ class ToolCombinationGenerator(BaseModule):
             'start_tool': start_tool,
             'tool_count': len(tool_ids),
             'metadata': {
-                'generated_at': datetime.now().isoformat(),
+                'generated_at': generated_at,
                 'scenario_id': scenario_id,
                 'generation_strategy': method
             }
         }
     
-    def _deduplicate_combinations(self, combinations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """去除重复的工具组合"""
+    def _deduplicate_combinations(self, combinations: Iterable[Dict[str, Any]],
+                                  limit: int = None) -> List[Dict[str, Any]]:
+        """
+        去除重复的工具组合（可直接消费生成器）
+        
+        Args:
+            combinations: 工具组合的可迭代对象
+            limit: 收集满该数量的不重复组合后停止消费，None 表示不限
+        """
         seen_signatures = set()
         unique_combinations = []
         
         for combo in combinations:
-            # 创建组合签名（忽略顺序）
-            tool_signature = tuple(sorted(combo['tool_ids']))
+            # 创建组合签名（忽略顺序，组合内工具不重复，frozenset 无需排序）
+            tool_signature = frozenset(combo['tool_ids'])
             
             if tool_signature not in seen_signatures:
                 seen_signatures.add(tool_signature)
                 unique_combinations.append(combo)
+                if limit is not None and len(unique_combinations) >= limit:
+                    break
         
         return unique_combinations
     
@@ -381,37 +471,61 @@ class ToolCombinationGenerator(BaseModule):
         
         from collections import Counter
         
-        # 基础统计
-        total_combinations = len(combinations)
-        tool_counts = [len(combo['tool_ids']) for combo in combinations]
-        
-        # 方法分布
-        methods = [combo.get('generation_method', '') for combo in combinations]
-        method_dist = Counter(methods)
+        # 单遍扫描同时统计组合大小、生成方法、场景与工具使用
+        size_dist = Counter()
+        method_dist = Counter()
+        scenario_dist = Counter()
+        tool_usage = Counter()
         
-        # 场景分布
-        scenarios = [combo.get('scenario_id', '') for combo in combinations]
-        scenario_dist = Counter(scenarios)
-        
-        # 工具使用统计
-        all_tools = []
         for combo in combinations:
-            all_tools.extend(combo['tool_ids'])
-        tool_usage = Counter(all_tools)
+            tool_ids = combo['tool_ids']
+            size_dist[len(tool_ids)] += 1
+            method_dist[combo.get('generation_method', '')] += 1
+            scenario_dist[combo.get('scenario_id', '')] += 1
+            tool_usage.update(tool_ids)
+        
+        total_combinations = len(combinations)
+        # 工具被引用的总次数，即所有组合大小之和（平均组合大小与平均使用次数共用）
+        total_tool_refs = sum(tool_usage.values())
         
         return {
             'total_combinations': total_combinations,
             'tool_count_distribution': {
-                'min': min(tool_counts),
-                'max': max(tool_counts),
-                'avg': sum(tool_counts) / len(tool_counts),
-                'distribution': dict(Counter(tool_counts))
+                'min': min(size_dist),
+                'max': max(size_dist),
+                'avg': total_tool_refs / total_combinations,
+                'distribution': dict(size_dist)
             },
             'generation_method_distribution': dict(method_dist),
             'scenario_distribution': dict(scenario_dist.most_common(10)),
             'tool_usage_stats': {
                 'unique_tools_used': len(tool_usage),
                 'most_used_tools': dict(tool_usage.most_common(10)),
-                'avg_usage_per_tool': sum(tool_usage.values()) / len(tool_usage)
+                'avg_usage_per_tool': total_tool_refs / len(tool_usage)
             }
         }
+
+
+# 进程池工作进程中的生成器实例（由 _init_worker 设置）
+_worker_generator: Optional[ToolCombinationGenerator] = None
+
+
+def _init_worker(config: Dict[str, Any]):
+    """进程池初始化：每个工作进程构建一次生成器"""
+    global _worker_generator
+    generator = ToolCombinationGenerator(config)
+    generator.initialize()
+    _worker_generator = generator
+
+
+def _generate_scenario_in_worker(task: Tuple[str, List[Dict[str, Any]], int, str, str]) -> List[Dict[str, Any]]:
+    """在工作进程中为单个场景建图并生成工具组合"""
+    scenario_id, tools_list, target_count, seed, generated_at = task
+    random.seed(seed)
+    
+    graph = _worker_generator._build_scenario_graph(scenario_id, tools_list)
+    if graph is None:
+        return []
+    return list(_worker_generator._generate_combinations_for_scenario(
+        scenario_id, graph, target_count, generated_at
+    ))
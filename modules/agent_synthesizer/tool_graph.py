@@ -3,7 +3,9 @@
 用于构建工具之间的关系图，并通过随机游走选择相关工具
 """
 
+import heapq
 import random
+from collections import deque
 from typing import Dict, Any, List, Optional, Tuple, Set
 import logging
 from datetime import datetime
@@ -14,6 +16,51 @@ from core.base_module import BaseModule
 from core.exceptions import AgentDataGenException
 from utils.file_manager import FileManager
 from utils.data_processor import DataProcessor
+from .scenario_graph import ScenarioGraph
+
+try:
+    from numba import njit, prange
+except ImportError:  # 未安装 numba 时使用 numpy 整块取 top-k
+    njit = None
+    prange = range
+
+HAS_NUMBA = njit is not None
+
+
+# 相似度矩阵按行分块计算，每块最多这么多行
+_SIMILARITY_BLOCK_ROWS = 1024
+# 单个相似度块的目标大小（字节），工具数很多时缩小块行数，使块留在缓存中
+_SIMILARITY_BLOCK_BYTES = 4 * 1024 * 1024
+
+
+def _top_k_rows(block, k, threshold, top, values):
+    """
+    逐行取相似度块中 j > i 且达到阈值的前 k 个候选（安装 numba 时按行并行）
+
+    结果按相似度从高到低写入 top[r] / values[r]，不足 k 个的位置保持 top 为 -1；
+    相似度相同时列号小的在前（与 numpy 路径的稳定排序一致）
+    """
+    for r in prange(block.shape[0]):
+        n_top = 0
+        for j in range(r + 1, block.shape[1]):
+            v = block[r, j]
+            # 未达阈值，或已满且不超过当前第 k 名时跳过（大部分候选在这里被过滤）
+            if v < threshold or (n_top == k and v <= values[r, k - 1]):
+                continue
+            # 插入排序：已满时挤掉第 k 名
+            pos = min(n_top, k - 1)
+            while pos > 0 and values[r, pos - 1] < v:
+                values[r, pos] = values[r, pos - 1]
+                top[r, pos] = top[r, pos - 1]
+                pos -= 1
+            values[r, pos] = v
+            top[r, pos] = j
+            if n_top < k:
+                n_top += 1
+
+
+if HAS_NUMBA:
+    _top_k_rows = njit(cache=True, nogil=True, parallel=True)(_top_k_rows)
 
 
 class ToolGraph(BaseModule):
@@ -38,11 +85,18 @@ class ToolGraph(BaseModule):
         self.similarity_threshold = 0.7
         self.min_similarity_threshold = 0.5
         self.max_edges_per_node = 10
+        # 相似度计算使用的精度：嵌入归一化后余弦值落在[-1, 1]，float32 足以区分阈值与top-k，
+        # 相比 float64 内存带宽减半，且矩阵乘法走 BLAS 的 sgemm
+        self.similarity_dtype = np.float32
         
         # 随机游走参数
         self.walk_length = 6  # 最大游走长度
         self.restart_probability = 0.15  # 重启概率
         
+        # 随机游走与邻居查询使用的CSR紧凑表示（build_graph / load_graph_from_file 后生成），
+        # networkx 图只用于构建、统计和保存
+        self.compact_graph: Optional[ScenarioGraph] = None
+        
     def _setup(self):
         """设置组件"""
         from config.settings import settings
@@ -80,10 +134,10 @@ class ToolGraph(BaseModule):
             # 生成统计信息
             stats = self._generate_graph_stats()
             
-            # 保存图数据
-            self._save_graph_data()
+            # 保存图数据（复用已生成的统计信息）
+            self._save_graph_data(stats)
             
-            self.logger.info(f"Successfully built tool graph with {len(tools)} tools")
+            self.logger.info("Successfully built tool graph with %d tools", len(tools))
             return stats
             
         except Exception as e:
@@ -98,11 +152,10 @@ class ToolGraph(BaseModule):
             tools: 工具列表
         """
         try:
-            self.logger.info(f"Building tool graph for {len(tools)} tools")
+            self.logger.info("Building tool graph for %d tools", len(tools))
             
             # 清空现有图
-            self.graph.clear()
-            self.tools_data.clear()
+            self.reset()
             
             # 添加节点
             for tool in tools:
@@ -114,13 +167,23 @@ class ToolGraph(BaseModule):
             # 构建边（基于相似度）
             self._build_edges_by_similarity(tools)
             
+            # 生成随机游走使用的CSR表示
+            self._finalize_csr()
             
-            self.logger.info(f"Graph built with {self.graph.number_of_nodes()} nodes and {self.graph.number_of_edges()} edges")
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("Graph built with %d nodes and %d edges",
+                                 self.graph.number_of_nodes(), self.graph.number_of_edges())
             
         except Exception as e:
             self.logger.error(f"Failed to build graph: {e}")
             raise AgentDataGenException(f"Graph building failed: {e}")
     
+    def reset(self) -> None:
+        """清空图、工具数据与CSR表示，保留已初始化的文件管理器等组件，便于复用同一实例构建下一张图"""
+        self.graph.clear()
+        self.tools_data.clear()
+        self.compact_graph = None
+    
     def _build_edges_by_similarity(self, tools: List[Dict[str, Any]]):
         """基于embedding相似度构建边"""
         tools_with_embeddings = [
@@ -128,32 +191,69 @@ class ToolGraph(BaseModule):
             if tool.get('metadata').get('embedding')
         ]
         
-        self.logger.info(f"Building similarity edges for {len(tools_with_embeddings)} tools with embeddings")
+        self.logger.info("Building similarity edges for %d tools with embeddings", len(tools_with_embeddings))
         
-        # 计算所有工具对之间的相似度
-        for i, tool1 in enumerate(tools_with_embeddings):
-            tool1_id = tool1.get('id')
-            tool1_embedding = tool1['metadata']['embedding']
-            
-            similarities = []
-            for j, tool2 in enumerate(tools_with_embeddings):
-                if i >= j:  # 避免重复计算
-                    continue
-                    
-                tool2_id = tool2.get('id')
-                tool2_embedding = tool2['metadata']['embedding']
-                
-                similarity = self._calculate_cosine_similarity(tool1_embedding, tool2_embedding)
+        if len(tools_with_embeddings) < 2:
+            return
+        
+        tool_ids = [tool.get('id') for tool in tools_with_embeddings]
+        try:
+            embeddings = np.asarray(
+                [tool['metadata']['embedding'] for tool in tools_with_embeddings], dtype=self.similarity_dtype
+            )
+            if embeddings.ndim != 2:
+                raise ValueError("embeddings have inconsistent dimensions")
+        except ValueError as e:
+            self.logger.error(f"Failed to stack tool embeddings: {e}")
+            return
+        
+        # 行向量归一化一次，余弦相似度即为点积（零向量的相似度为0）
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings /= np.maximum(norms, 1e-12)
+        
+        n = len(tool_ids)
+        k = min(self.max_edges_per_node, n - 1)
+        if k <= 0:
+            return
+        # 候选需达到 min_similarity_threshold，入选的邻居再需达到 similarity_threshold
+        threshold = max(self.similarity_threshold, self.min_similarity_threshold)
+        
+        # 按行分块做矩阵乘法，峰值内存为块大小而非 N×N；块行数按块字节数上限收缩
+        block_rows = max(1, min(_SIMILARITY_BLOCK_ROWS, _SIMILARITY_BLOCK_BYTES // (n * embeddings.itemsize)))
+        for block_start in range(0, n - 1, block_rows):
+            block_end = min(block_start + block_rows, n)
+            # 块内各行只需要 j > i 的列，block_start 之前的列不参与计算
+            similarity_block = embeddings[block_start:block_end] @ embeddings[block_start:].T
+            rows, cols = similarity_block.shape
+            
+            if HAS_NUMBA:
+                # 编译后的内核按行并行取 top-k，未填满的位置 top 为 -1
+                top = np.full((rows, k), -1, dtype=np.int64)
+                values = np.empty((rows, k), dtype=similarity_block.dtype)
+                _top_k_rows(similarity_block, k, threshold, top, values)
+                src, rank = np.nonzero(top >= 0)
+            else:
+                # 屏蔽 j <= i 的列（每对只计算一次）
+                similarity_block[np.tril_indices(rows, 0, cols)] = -np.inf
                 
-                if similarity >= self.min_similarity_threshold:
-                    similarities.append((tool2_id, similarity))
-            
-            # 为每个工具保留最相似的几个工具作为邻居
-            similarities.sort(key=lambda x: x[1], reverse=True)
-            
-            for tool2_id, similarity in similarities[:self.max_edges_per_node]:
-                if similarity >= self.similarity_threshold:
-                    self.graph.add_edge(tool1_id, tool2_id, weight=similarity, edge_type='similarity')
+                # 整块一次取出每行最相似的 k 个候选，并按相似度从高到低排列
+                if cols > k:
+                    top = np.argpartition(-similarity_block, k - 1, axis=1)[:, :k]
+                else:
+                    top = np.broadcast_to(np.arange(cols), (rows, cols))
+                values = np.take_along_axis(similarity_block, top, axis=1)
+                order = np.argsort(-values, axis=1, kind='stable')
+                top = np.take_along_axis(top, order, axis=1)
+                values = np.take_along_axis(values, order, axis=1)
+                src, rank = np.nonzero(values >= threshold)
+            
+            # 达到阈值的候选直接成边；nonzero 按行优先返回，加边顺序与逐行处理相同
+            self.graph.add_edges_from(
+                (tool_ids[i], tool_ids[j], {'weight': w, 'edge_type': 'similarity'})
+                for i, j, w in zip((src + block_start).tolist(),
+                                   (top[src, rank] + block_start).tolist(),
+                                   values[src, rank].tolist())
+            )
     
     def _build_edges_by_category_and_domain(self, tools: List[Dict[str, Any]]):
         """基于类别和领域构建边"""
@@ -200,23 +300,18 @@ class ToolGraph(BaseModule):
                     self.graph.add_edge(tool1_id, tool2_id, weight=weight, edge_type=edge_type)
     
     def _calculate_cosine_similarity(self, embedding1: List[float], embedding2: List[float]) -> float:
-        """计算余弦相似度"""
-        try:
-            vec1 = np.array(embedding1)
-            vec2 = np.array(embedding2)
-            
-            dot_product = np.dot(vec1, vec2)
-            norm1 = np.linalg.norm(vec1)
-            norm2 = np.linalg.norm(vec2)
-            
-            if norm1 == 0 or norm2 == 0:
-                return 0.0
-            
-            return dot_product / (norm1 * norm2)
-            
-        except Exception as e:
-            self.logger.error(f"Failed to calculate cosine similarity: {e}")
+        """
+        计算余弦相似度（单对计算；批量建边见 _build_edges_by_similarity）
+        embedding 维度在建图时统一校验，维度不一致时由 numpy 直接抛出 ValueError
+        """
+        vec1 = np.asarray(embedding1, dtype=np.float64)
+        vec2 = np.asarray(embedding2, dtype=np.float64)
+        
+        # 两个平方和相乘后只开一次方，避免两次 np.linalg.norm 的分派开销
+        denominator = np.vdot(vec1, vec1) * np.vdot(vec2, vec2)
+        if not denominator:
             return 0.0
+        return float(np.dot(vec1, vec2) / np.sqrt(denominator))
     
     def random_walk_selection(self, start_tool: str, count: int, restart_prob: float = None) -> List[str]:
         """
@@ -235,6 +330,13 @@ class ToolGraph(BaseModule):
             return []
         
         restart_prob = restart_prob or self.restart_probability
+        
+        # 常规路径：在CSR表示上游走（邻居为连续切片，别名表 O(1) 采样）
+        compact_graph = self.compact_graph
+        if compact_graph is not None and start_tool in compact_graph.name_to_idx:
+            return compact_graph.random_walk_batch([start_tool], [count], restart_prob)[0]
+        
+        # 回退路径：图在生成CSR后被修改过，直接在 networkx 图上游走
         selected_tools = set()
         current_tool = start_tool
         
@@ -251,48 +353,46 @@ class ToolGraph(BaseModule):
                 current_tool = start_tool
                 continue
             
-            # 获取邻居节点
+            # 根据边权重选择下一个节点，没有邻居时回到起点
             neighbors = list(self.graph.neighbors(current_tool))
-            if not neighbors:
-                current_tool = start_tool
-                continue
-            
-            # 根据边权重选择下一个节点
-            next_tool = self._weighted_random_choice(current_tool, neighbors)
-            current_tool = next_tool
+            current_tool = self._weighted_random_choice(current_tool, neighbors) if neighbors else start_tool
         
         # 移除起始工具，因为它不算在选择结果中
-        selected_tools.discard(start_tool)
+        selected_tools = [tool for tool in selected_tools if tool != start_tool]
         
         # 如果选择的工具不够，补充最相似的工具
         if len(selected_tools) < count:
-            additional_tools = self.get_related_tools(start_tool, count - len(selected_tools))
-            selected_tools.update(additional_tools)
+            selected_set = set(selected_tools)
+            for tool in self.get_related_tools(start_tool, count - len(selected_tools)):
+                if tool not in selected_set:
+                    selected_tools.append(tool)
+                    selected_set.add(tool)
         
-        return list(selected_tools)[:count]
+        return selected_tools[:count]
+    
+    def _finalize_csr(self) -> None:
+        """
+        将当前图压缩为CSR紧凑表示（节点下标、邻接切片、别名采样表），供随机游走和邻居查询使用
+        图结构变化后需要重新调用
+        """
+        self.compact_graph = ScenarioGraph.from_graph(
+            self.graph, self.walk_length, self.restart_probability
+        )
     
     def _weighted_random_choice(self, current_tool: str, neighbors: List[str]) -> str:
-        """根据边权重随机选择邻居"""
-        try:
-            weights = []
-            for neighbor in neighbors:
-                edge_data = self.graph.get_edge_data(current_tool, neighbor)
-                weight = edge_data.get('weight', 0.5) if edge_data else 0.5
-                weights.append(weight)
-            
-            # 归一化权重
-            total_weight = sum(weights)
-            if total_weight == 0:
-                return random.choice(neighbors)
-            
-            weights = [w / total_weight for w in weights]
-            
-            # 根据权重随机选择
-            return np.random.choice(neighbors, p=weights)
-            
-        except Exception as e:
-            self.logger.error(f"Failed to make weighted random choice: {e}")
+        """
+        根据边权重随机选择邻居（节点不在CSR表示中时的回退路径）
+        neighbors 必须是 current_tool 在图中的邻居，调用方已保证，这里不再做异常兜底
+        """
+        adjacency = self.graph.adj[current_tool]
+        weights = [adjacency[neighbor].get('weight', 0.5) for neighbor in neighbors]
+        
+        # 权重总和为0时均匀选择
+        if sum(weights) == 0:
             return random.choice(neighbors)
+        
+        # random.choices 内部做累积和+二分查找，无需归一化，也没有 numpy 的调用开销
+        return random.choices(neighbors, weights=weights)[0]
     
     def get_related_tools(self, tool_id: str, max_count: int) -> List[str]:
         """
@@ -308,20 +408,17 @@ class ToolGraph(BaseModule):
         if tool_id not in self.graph:
             return []
         
-        # 获取直接邻居
-        neighbors = list(self.graph.neighbors(tool_id))
-        
-        # 按边权重排序
-        neighbor_weights = []
-        for neighbor in neighbors:
-            edge_data = self.graph.get_edge_data(tool_id, neighbor)
-            weight = edge_data.get('weight', 0.5) if edge_data else 0.5
-            neighbor_weights.append((neighbor, weight))
+        compact_graph = self.compact_graph
+        if compact_graph is not None and tool_id in compact_graph.name_to_idx:
+            return compact_graph.get_related_tools(tool_id, max_count)
         
-        neighbor_weights.sort(key=lambda x: x[1], reverse=True)
-        
-        # 返回前max_count个邻居
-        return [neighbor for neighbor, _ in neighbor_weights[:max_count]]
+        # 获取直接邻居，按边权重取前max_count个（部分选择，不对全部邻居排序）
+        neighbor_weights = [
+            (neighbor, edge_data.get('weight', 0.5))
+            for neighbor, edge_data in self.graph.adj[tool_id].items()
+        ]
+        top = heapq.nlargest(max_count, neighbor_weights, key=lambda x: x[1])
+        return [neighbor for neighbor, _ in top]
     
     def get_tool_cluster(self, tool_id: str, max_size: int = 6) -> List[str]:
         """
@@ -337,23 +434,21 @@ class ToolGraph(BaseModule):
         if tool_id not in self.graph:
             return [tool_id] if tool_id in self.tools_data else []
         
-        # 使用BFS构建工具簇
-        visited = set()
-        queue = [tool_id]
+        # 使用BFS构建工具簇（入队时即标记为已访问，队列中不会出现重复节点）
+        visited = {tool_id}
+        queue = deque([tool_id])
         cluster = []
         
         while queue and len(cluster) < max_size:
-            current = queue.pop(0)
-            if current in visited:
-                continue
-                
-            visited.add(current)
+            current = queue.popleft()
             cluster.append(current)
             
             # 添加邻居到队列
-            neighbors = list(self.graph.neighbors(current))
-            for neighbor in neighbors:
-                if neighbor not in visited and len(cluster) + len(queue) < max_size:
+            for neighbor in self.graph.neighbors(current):
+                if len(cluster) + len(queue) >= max_size:
+                    break
+                if neighbor not in visited:
+                    visited.add(neighbor)
                     queue.append(neighbor)
         
         return cluster
@@ -369,12 +464,16 @@ class ToolGraph(BaseModule):
     def _generate_graph_stats(self) -> Dict[str, Any]:
         """生成图统计信息"""
         try:
+            num_nodes = self.graph.number_of_nodes()
+            num_edges = self.graph.number_of_edges()
+            # 连通分量只遍历一次，分量数与最大分量大小都从同一结果得出
+            components = list(nx.connected_components(self.graph))
             stats = {
-                'total_nodes': self.graph.number_of_nodes(),
-                'total_edges': self.graph.number_of_edges(),
-                'average_degree': sum(dict(self.graph.degree()).values()) / self.graph.number_of_nodes() if self.graph.number_of_nodes() > 0 else 0,
-                'connected_components': nx.number_connected_components(self.graph),
-                'largest_component_size': len(max(nx.connected_components(self.graph), key=len)) if self.graph.number_of_nodes() > 0 else 0,
+                'total_nodes': num_nodes,
+                'total_edges': num_edges,
+                'average_degree': 2 * num_edges / num_nodes if num_nodes > 0 else 0,
+                'connected_components': len(components),
+                'largest_component_size': max((len(c) for c in components), default=0),
                 'edge_types': self._count_edge_types(),
                 'generated_at': datetime.now().isoformat()
             }
@@ -393,8 +492,13 @@ class ToolGraph(BaseModule):
             edge_types[edge_type] = edge_types.get(edge_type, 0) + 1
         return edge_types
     
-    def _save_graph_data(self):
-        """保存图数据"""
+    def _save_graph_data(self, stats: Optional[Dict[str, Any]] = None):
+        """
+        保存图数据
+
+        Args:
+            stats: 已生成的图统计信息，为空时重新生成
+        """
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             
@@ -411,13 +515,13 @@ class ToolGraph(BaseModule):
             graph_data = {
                 'nodes': list(self.graph.nodes()),
                 'edges': edges_data,
-                'stats': self._generate_graph_stats()
+                'stats': stats if stats is not None else self._generate_graph_stats()
             }
             
             filename = f"tool_graph_{timestamp}.json"
             self.file_manager.save_json(graph_data, filename)
             
-            self.logger.info(f"Saved tool graph to {filename}")
+            self.logger.info("Saved tool graph to %s", filename)
             
         except Exception as e:
             self.logger.error(f"Failed to save graph data: {e}")
@@ -454,9 +558,11 @@ class ToolGraph(BaseModule):
                     edge_type=edge.get('edge_type', 'unknown')
                 )
             
+            self._finalize_csr()
+            
             self.logger.info(f"Successfully loaded graph from {file_path}")
             return True
             
         except Exception as e:
             self.logger.error(f"Failed to load graph from file: {e}")
-            return False
\ No newline at end of file
+            return False
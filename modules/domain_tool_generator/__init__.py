@@ -1,12 +1,18 @@
 """
 场景与工具生成模块
 负责生成应用场景和相关工具
+各组件在首次访问时才导入（PEP 562），只生成场景时不会加载工具嵌入等依赖
 """
 
-from .scenario_generator import ScenarioGenerator
-from .tool_designer import ToolDesigner
-# from .tool_registry import ToolRegistry
-from .tool_embedding import ToolEmbedding
+import importlib
+
+_LAZY = {
+    'ScenarioGenerator': 'scenario_generator',
+    'ToolDesigner': 'tool_designer',
+    # 'ToolRegistry': 'tool_registry',
+    'ToolEmbedding': 'tool_embedding',
+}
+
 # from core.base_module import BaseModule
 # from typing import Dict, Any, List
 # import logging
@@ -100,4 +106,17 @@ __all__ = [
     'ToolDesigner', 
     # 'ToolRegistry',
     'ToolEmbedding'
-] 
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module("." + _LAZY[name], __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -3,8 +3,9 @@
 负责基于领域生成多样化的应用场景
 """
 
+import asyncio
 import uuid
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 from datetime import datetime
 import logging
 
@@ -16,6 +17,9 @@ from utils.llm_client import LLMClient
 from utils.data_processor import DataProcessor
 from utils.file_manager import FileManager
 
+# 场景批次索引：每次保存追加一行 {filename, count, domains}
+_SCENARIO_INDEX_FILENAME = "scenarios_index.jsonl"
+
 
 class ScenarioGenerator(BaseModule):
     """场景生成器"""
@@ -34,6 +38,9 @@ class ScenarioGenerator(BaseModule):
         self.data_processor = None
         self.file_manager = None
         self.prompts = ScenarioPrompts()
+        self.concurrency = 1
+        # (领域, 数量) -> 提示词（同一领域的各批次数量基本相同，只渲染一次）
+        self._prompt_cache: Dict[Tuple[str, int], str] = {}
     
     def _setup(self):
         """设置组件"""
@@ -50,6 +57,9 @@ class ScenarioGenerator(BaseModule):
         # 初始化文件管理器
         data_path = settings.get_data_path('scenarios')
         self.file_manager = FileManager(data_path, self.logger)
+        
+        # 场景生成以等待LLM响应为主，默认按全局并发配置同时发出多个请求
+        self.concurrency = self.config.get('concurrency', settings.CONCURRENCY_CONFIG['max_workers'])
     
     def process(self, input_data: Dict[str, Any], **kwargs) -> List[Dict[str, Any]]:
         """
@@ -74,9 +84,15 @@ class ScenarioGenerator(BaseModule):
             all_scenarios = []
             scenarios_per_domain = target_count // len(domains)
             
-            for domain in domains:
-                domain_scenarios = self._generate_domain_scenarios(domain, scenarios_per_domain)
-                all_scenarios.extend(domain_scenarios)
+            if self.concurrency > 1:
+                # 所有 (领域, 批次) 请求并发发出，总耗时接近最慢的几轮请求而非全部请求之和
+                all_scenarios = asyncio.run(
+                    self._generate_all_domain_scenarios_async(domains, scenarios_per_domain)
+                )
+            else:
+                for domain in domains:
+                    domain_scenarios = self._generate_domain_scenarios(domain, scenarios_per_domain)
+                    all_scenarios.extend(domain_scenarios)
             
             # 保存生成的场景
             self._save_scenarios(all_scenarios)
@@ -112,6 +128,79 @@ class ScenarioGenerator(BaseModule):
         
         return scenarios[:count]
     
+    async def _generate_all_domain_scenarios_async(self, domains: List[str], count: int) -> List[Dict[str, Any]]:
+        """
+        并发为所有领域生成场景，同时进行的请求数不超过 self.concurrency
+        每轮为仍未达到目标数量的领域补发请求，某轮没有任何产出的领域不再重试
+        
+        Args:
+            domains: 领域列表
+            count: 每个领域的生成数量
+            
+        Returns:
+            按领域顺序排列的场景列表
+        """
+        try:
+            return await self._generate_domain_rounds_async(domains, count)
+        finally:
+            # 异步客户端的连接绑定于本次 asyncio.run 的事件循环，循环结束前关闭
+            await self.llm_client.aclose()
+    
+    async def _generate_domain_rounds_async(self, domains: List[str], count: int) -> List[Dict[str, Any]]:
+        """按轮次并发补发请求，直到各领域达到目标数量或某轮没有产出"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        batch_size = self.config.get('batch_size', 5)
+        results: Dict[str, List[Dict[str, Any]]] = {domain: [] for domain in domains}
+        pending = {domain: count for domain in domains if count > 0}
+        
+        while pending:
+            tasks = [
+                (domain, min(batch_size, remaining - start))
+                for domain, remaining in pending.items()
+                for start in range(0, remaining, batch_size)
+            ]
+            batches = await asyncio.gather(*(
+                self._generate_scenario_batch_async(domain, batch_count, semaphore)
+                for domain, batch_count in tasks
+            ))
+            
+            progressed = set()
+            for (domain, _), batch_scenarios in zip(tasks, batches):
+                if batch_scenarios:
+                    results[domain].extend(batch_scenarios)
+                    progressed.add(domain)
+            
+            pending = {
+                domain: count - len(results[domain])
+                for domain in pending
+                if domain in progressed and len(results[domain]) < count
+            }
+        
+        return [scenario for domain in domains for scenario in results[domain][:count]]
+    
+    async def _generate_scenario_batch_async(self, domain: str, count: int,
+                                             semaphore: asyncio.Semaphore) -> List[Dict[str, Any]]:
+        """
+        异步生成一批场景（_generate_scenario_batch 的并发版本）
+        
+        Args:
+            domain: 领域名称
+            count: 生成数量
+            semaphore: 限制同时进行的请求数
+            
+        Returns:
+            场景列表
+        """
+        try:
+            prompt = self._build_prompt(domain, count)
+            async with semaphore:
+                response = await self.llm_client.agenerate_completion(prompt)
+            return self._parse_scenario_batch(response, domain)
+            
+        except Exception as e:
+            self.logger.error(f"Failed to generate scenario batch for {domain}: {e}")
+            return []
+    
     def _generate_scenario_batch(self, domain: str, count: int) -> List[Dict[str, Any]]:
         """
         生成一批场景
@@ -124,25 +213,43 @@ class ScenarioGenerator(BaseModule):
             场景列表
         """
         try:
-            prompt = self.prompts.SCENARIO_GENERATION.format(
-                domain=domain,
-                count=count
-            )
+            prompt = self._build_prompt(domain, count)
             response = self.llm_client.generate_completion(prompt)
-            scenarios_data = self.llm_client.parse_json_response(response)
-            # 处理和标准化场景数据
-            scenarios = []
-            for scenario_data in scenarios_data:
-                if self._validate_scenario_data(scenario_data):
-                    processed_scenario = self._process_scenario_data(scenario_data, domain)
-                    scenarios.append(processed_scenario)
-            self.logger.debug(f"Generated {len(scenarios)} scenarios for {domain}")
-            return scenarios
+            return self._parse_scenario_batch(response, domain)
             
         except Exception as e:
             self.logger.error(f"Failed to generate scenario batch for {domain}: {e}")
             return []
     
+    def _build_prompt(self, domain: str, count: int) -> str:
+        """渲染场景生成提示词，按 (领域, 数量) 缓存"""
+        key = (domain, count)
+        prompt = self._prompt_cache.get(key)
+        if prompt is None:
+            prompt = self._prompt_cache[key] = self.prompts.scenario_generation(domain=domain, count=count)
+        return prompt
+    
+    def _parse_scenario_batch(self, response, domain: str) -> List[Dict[str, Any]]:
+        """
+        解析LLM响应并处理为场景列表（同步与异步批次共用）
+        
+        Args:
+            response: LLM响应
+            domain: 领域名称
+            
+        Returns:
+            场景列表
+        """
+        scenarios_data = self.llm_client.parse_json_response(response)
+        # 处理和标准化场景数据
+        scenarios = []
+        for scenario_data in scenarios_data:
+            if self._validate_scenario_data(scenario_data):
+                processed_scenario = self._process_scenario_data(scenario_data, domain)
+                scenarios.append(processed_scenario)
+        self.logger.debug(f"Generated {len(scenarios)} scenarios for {domain}")
+        return scenarios
+    
     def _validate_scenario_data(self, scenario_data: Dict[str, Any]) -> bool:
         """
         验证场景数据
@@ -212,6 +319,13 @@ class ScenarioGenerator(BaseModule):
             summary_filename = f"scenarios_summary_{timestamp}.json"
             self.file_manager.save_json(summary, summary_filename)
             
+            # 追加到批次索引，统计时只读索引而不必重新加载每个批次文件
+            self.file_manager.append_jsonl({
+                'filename': filename,
+                'count': summary['total_count'],
+                'domains': summary['domains'],
+            }, _SCENARIO_INDEX_FILENAME)
+            
             self.logger.info(f"Saved {len(scenarios)} scenarios to {filename}")
             
         except Exception as e:
@@ -231,7 +345,20 @@ class ScenarioGenerator(BaseModule):
             total_scenarios = 0
             domains = set()
             
+            # 已登记在索引中的批次直接使用索引记录的数量和领域
+            indexed = {}
+            if self.file_manager.list_files(".", _SCENARIO_INDEX_FILENAME):
+                for record in self.file_manager.load_jsonl(_SCENARIO_INDEX_FILENAME):
+                    indexed[record['filename']] = record
+            
             for file_path in scenario_files:
+                record = indexed.get(file_path.name)
+                if record is not None:
+                    total_scenarios += record['count']
+                    domains.update(record['domains'])
+                    continue
+                
+                # 索引建立之前保存的批次，回退到完整加载
                 scenarios = self.file_manager.load_json(file_path)
                 total_scenarios += len(scenarios)
                 
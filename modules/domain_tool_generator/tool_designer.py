@@ -170,7 +170,7 @@ class ToolDesigner(BaseModule):
             self.logger.error(f"Failed to generate tool batch: {e}")
             return []
     
-    def _build_tool_generation_prompt(self, scenario: Dict[str, Any], count: int) -> str:
+    def _build_tool_generation_prompt(self, scenario: Dict[str, Any], count: int) -> List[Dict[str, Any]]:
         """
         构建工具生成提示词
         
@@ -179,9 +179,9 @@ class ToolDesigner(BaseModule):
             count: 生成数量
             
         Returns:
-            提示词字符串
+            提示词内容块列表
         """
-        return self.prompts.TOOL_GENERATION.format(
+        return self.prompts.build_tool_generation(
             scenario_name=scenario.get('name', ''),
             scenario_description=scenario.get('description', ''),
             scenario_domain=scenario.get('domain', ''),
@@ -280,7 +280,7 @@ class ToolDesigner(BaseModule):
             优化后的工具
         """
         try:
-            prompt = self.prompts.TOOL_REFINEMENT.format(tool_data=tool)
+            prompt = self.prompts.tool_refinement(tool_data=tool)
             
             response = self.llm_client.generate_completion(prompt)
             refined_data = self.llm_client.parse_json_response(response)
@@ -302,7 +302,7 @@ class ToolDesigner(BaseModule):
             评估结果
         """
         try:
-            prompt = self.prompts.TOOL_VALIDATION.format(tool_data=tool)
+            prompt = self.prompts.tool_validation(tool_data=tool)
             
             response = self.llm_client.generate_completion(prompt)
             evaluation = self.llm_client.parse_json_response(response)
@@ -64,7 +64,7 @@ class InteractionCoordinator(BaseModule):
         # 更新配置
         config = self.config or {}
         self.max_turns = config.get('max_turns', 20)
-        print(f"max_turns: {self.max_turns}")
+        self.logger.debug("max_turns: %s", self.max_turns)
             
     def execute_single_interaction(self, task: Task, agent_config: AgentConfig, tools_info: Dict[str, Any]) -> Trajectory:
         """
@@ -127,7 +127,7 @@ class InteractionCoordinator(BaseModule):
                 if last_recipient == "user":
                     # 轮到用户发言，调用用户模拟器
                     last_message = self.session_manager.get_last_message()
-                    conversation_history = self.session_manager.get_conversation_history()
+                    conversation_history = self.session_manager.get_conversation_lines()
                     
                     user_response = self.user_simulator.respond_to_agent(
                         last_message.get("message", ""),
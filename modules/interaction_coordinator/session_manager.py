@@ -150,9 +150,13 @@ class SessionManager(BaseModule):
     
     def get_conversation_history(self) -> str:
         """获取格式化的对话历史"""
+        return "\n".join(self.get_conversation_lines())
+    
+    def get_conversation_lines(self) -> List[str]:
+        """获取逐条格式化的对话历史行"""
         try:
             if not self.current_session:
-                return ""
+                return []
                 
             history_lines = []
             
@@ -173,11 +177,11 @@ class SessionManager(BaseModule):
                     else:
                         history_lines.append(f"execution: {message}")
             
-            return "\n".join(history_lines)
+            return history_lines
             
         except Exception as e:
             self.logger.error(f"Failed to get conversation history: {e}")
-            return ""
+            return []
     
     def should_end_conversation(self) -> bool:
         """判断是否应该结束对话"""
@@ -236,13 +240,13 @@ class SessionManager(BaseModule):
         """保存会话轨迹"""
         try:
             # 转换为训练数据格式
-            training_data = trajectory.to_training_format()
+            training_json = trajectory.to_training_json()
             
             # 保存文件
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"{trajectory.id}_{timestamp}.json"
             
-            self.file_manager.save_json(training_data, filename)
+            self.file_manager.save_text(training_json, filename)
             self.logger.info(f"Saved trajectory to {filename}")
             
             return filename
@@ -79,7 +79,7 @@ class TrajectoryEvaluator(BaseModule):
             # 调用LLM进行评估
             evaluation_response = self.llm_client.generate_completion(
                 prompt=evaluation_prompt,
-                system_prompt=self.evaluation_prompts.TRAJECTORY_EVALUATION_SYSTEM,
+                system_prompt=self.evaluation_prompts.build_evaluation_system(),
                 temperature=0.1,  # 低温度确保评估的一致性
             )
             
@@ -148,6 +148,25 @@ class TrajectoryEvaluator(BaseModule):
             "tool_results": tool_results,
         }
     
+    def _format_evaluation_fields(self, evaluation_data: Dict[str, Any]) -> Dict[str, str]:
+        """
+        将评估数据格式化为提示词模板参数
+        
+        Args:
+            evaluation_data: 评估数据
+            
+        Returns:
+            模板参数字典
+        """
+        task_info = evaluation_data["task_info"]
+        
+        return {
+            "task_description": task_info.get("description", ""),
+            "tool_usage_expectations": "\n".join([f"- {expection}" for expection in task_info.get("tool_usage_expectations", [])]),
+            "conversation_history": json.dumps(evaluation_data["conversation_history"], indent=2, ensure_ascii=False),
+            "tool_results": json.dumps(evaluation_data["tool_results"], indent=2, ensure_ascii=False),
+        }
+    
     def _generate_evaluation_prompt(self, evaluation_data: Dict[str, Any]) -> str:
         """
         生成评估提示词
@@ -158,15 +177,104 @@ class TrajectoryEvaluator(BaseModule):
         Returns:
             评估提示词
         """
-        task_info = evaluation_data["task_info"]
-        
-        return self.evaluation_prompts.TRAJECTORY_EVALUATION_USER.format(
-            task_description=task_info.get("description", ""),
-            tool_usage_expectations="\n".join([f"- {expection}" for expection in task_info.get("tool_usage_expectations", [])]),
-            conversation_history=json.dumps(evaluation_data["conversation_history"], indent=2, ensure_ascii=False),
-            tool_results=json.dumps(evaluation_data["tool_results"], indent=2, ensure_ascii=False)
+        return self.evaluation_prompts.trajectory_evaluation_user(
+            **self._format_evaluation_fields(evaluation_data)
         )
     
+    def evaluate_trajectories(
+        self,
+        trajectories: List[Trajectory],
+        tasks: Optional[Dict[str, Task]] = None,
+        batch_size: Optional[int] = None
+    ) -> List[Trajectory]:
+        """
+        批量评估轨迹，每批只发送一次系统提示词和一次请求
+        
+        Args:
+            trajectories: 要评估的轨迹列表
+            tasks: 轨迹ID到任务信息的映射（可选）
+            batch_size: 每批轨迹数量，默认读取 quality_config 中的 batch_size
+            
+        Returns:
+            已评分的轨迹列表
+        """
+        tasks = tasks or {}
+        batch_size = batch_size or self.quality_config.get("batch_size", 5)
+        scored = []
+        
+        for i in range(0, len(trajectories), batch_size):
+            batch = trajectories[i:i + batch_size]
+            if len(batch) == 1:
+                scored.append(self.evaluate_trajectory(batch[0], tasks.get(batch[0].id)))
+                continue
+            
+            try:
+                self.logger.info(f"Evaluating trajectory batch of {len(batch)}: {[t.id for t in batch]}")
+                evaluation_prompt = self.evaluation_prompts.trajectory_evaluation_user_batch([
+                    {
+                        "trajectory_id": trajectory.id,
+                        **self._format_evaluation_fields(
+                            self._prepare_evaluation_data(trajectory, tasks.get(trajectory.id))
+                        ),
+                    }
+                    for trajectory in batch
+                ])
+                evaluation_response = self.llm_client.generate_completion(
+                    prompt=evaluation_prompt,
+                    system_prompt=self.evaluation_prompts.build_evaluation_system(),
+                    temperature=0.1,
+                )
+                results = self._parse_batch_response(evaluation_response, [t.id for t in batch])
+            except Exception as e:
+                # 批量结果不可用时逐条回退评估
+                self.logger.warning(f"Batch evaluation failed, falling back to single-shot: {e}")
+                for trajectory in batch:
+                    try:
+                        scored.append(self.evaluate_trajectory(trajectory, tasks.get(trajectory.id)))
+                    except QualityEvaluationError as single_error:
+                        self.logger.error(f"Skipping trajectory {trajectory.id}: {single_error}")
+                continue
+            
+            for trajectory in batch:
+                trajectory.evaluation_score = TrajectoryScore(
+                    overall_score=results[trajectory.id].get("overall_score", 0)
+                )
+                self.save_trajectory_evaluation(trajectory)
+                scored.append(trajectory)
+        
+        return scored
+    
+    def _parse_batch_response(self, response: LLMResponse, trajectory_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        解析批量评估结果，并校验结果与输入轨迹一一对应
+        
+        Args:
+            response: LLM响应
+            trajectory_ids: 本批轨迹ID列表
+            
+        Returns:
+            轨迹ID到评估结果的映射
+        """
+        results = self.llm_client.parse_json_response(response)
+        if not isinstance(results, list) or len(results) != len(trajectory_ids):
+            raise QualityEvaluationError(
+                f"Batch evaluation returned {len(results) if isinstance(results, list) else 'non-list'} "
+                f"results for {len(trajectory_ids)} trajectories"
+            )
+        
+        by_id = {}
+        for result in results:
+            overall_score = result.get("overall_score") if isinstance(result, dict) else None
+            if not isinstance(overall_score, (int, float)) or not 0 <= overall_score <= 5:
+                raise QualityEvaluationError(f"Invalid overall score in batch result: {result}")
+            by_id[str(result.get("trajectory_id"))] = result
+        
+        missing = [tid for tid in trajectory_ids if tid not in by_id]
+        if missing:
+            raise QualityEvaluationError(f"Batch evaluation missing trajectories: {missing}")
+        
+        return by_id
+    
     def _parse_evaluation_result(self, response: LLMResponse) -> Dict[str, Any]:
         """
         解析评估结果
@@ -250,13 +358,13 @@ class TrajectoryEvaluator(BaseModule):
             保存结果信息字典
         """
         try:
-            training_data = trajectory.to_training_format()
+            training_json = trajectory.to_training_json()
             
             # 保存文件
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"{trajectory.id}_{timestamp}.json"
             
-            self.file_manager.save_json(training_data, filename)
+            self.file_manager.save_text(training_json, filename)
             self.logger.info(f"Saved trajectory to {filename}")
             
             return filename
@@ -53,16 +53,16 @@ class TaskDesigner(BaseModule):
                             difficulty: DifficultyLevel) -> Optional[Task]:
         """生成单个任务"""
         try:
+            from config.prompts import format_tools
             from config.prompts.task_prompts import TaskPrompts
             
             # 准备工具信息
             tools_details = self._format_tools_for_prompt(tools_info)
-            available_tools = [tool['name'] for tool in tools_info]
+            available_tools = sorted(tool['name'] for tool in tools_info)
             
             # 构建提示词
-            prompts = TaskPrompts()
-            prompt = prompts.TASK_GENERATION.format(
-                available_tools=available_tools,
+            prompt = TaskPrompts.build_task_generation(
+                available_tools=format_tools(available_tools),
                 tools_details=tools_details,
                 difficulty=difficulty.value
             )
@@ -102,36 +102,26 @@ class TaskDesigner(BaseModule):
         return tools_info
     
     def _format_tools_for_prompt(self, tools_info: List[Dict[str, Any]]) -> str:
-        """格式化工具信息用于提示词"""
-        tool_descriptions = []
+        """格式化工具信息用于提示词（按工具排序后稳定序列化）"""
+        from config.prompts import format_tool_set
         
+        tool_summaries = []
         for tool in tools_info:
-            tool_name = tool.get('name', '')
-            tool_desc = tool.get('description', '')
-            parameters = tool.get('parameters', [])
-            
-            # 构建参数信息
-            param_list = []
-            for param in parameters:
-                param_name = param.get('name', '')
-                param_type = param.get('type', '')
-                param_desc = param.get('description', '')
-                required = param.get('required', False)
-                
-                param_info = f"  - {param_name} ({param_type})"
-                if required:
-                    param_info += " [必填]"
-                param_info += f": {param_desc}"
-                param_list.append(param_info)
-            
-            # 构建工具描述
-            tool_text = f"**{tool_name}**\\n功能：{tool_desc}"
-            if param_list:
-                tool_text += "\\n参数：\\n" + "\\n".join(param_list)
-            
-            tool_descriptions.append(tool_text)
+            tool_summaries.append({
+                "name": tool.get('name', ''),
+                "description": tool.get('description', ''),
+                "parameters": [
+                    {
+                        "name": param.get('name', ''),
+                        "type": param.get('type', ''),
+                        "required": param.get('required', False),
+                        "description": param.get('description', ''),
+                    }
+                    for param in tool.get('parameters', [])
+                ],
+            })
         
-        return "\\n\\n".join(tool_descriptions)
+        return format_tool_set(tool_summaries)
     
     def _validate_task_data(self, task_data: Dict[str, Any], available_tools: List[str]) -> bool:
         """验证生成的任务数据"""
@@ -220,7 +220,7 @@ class ExecutionEngine(BaseModule):
             
             
             # 构建提示词
-            prompt = self.prompts.EXECUTION_RESULT_TEMPLATE.format(
+            prompt = self.prompts.execution_result(
                 tool_call=tool_call_text,
                 examples=examples_text,
                 execution_type=execution_type,
@@ -230,7 +230,7 @@ class ExecutionEngine(BaseModule):
             # 调用LLM生成结果
             response = self.llm_client.generate_completion(
                 prompt=prompt,
-                system_prompt=self.prompts.TOOL_EXECUTION_SYSTEM,
+                system_prompt=self.prompts.build_execution_system(),
             )            
             # 解析LLM响应
             try:
@@ -10,6 +10,7 @@ import logging
 
 from core.base_module import BaseModule
 from core.exceptions import AgentDataGenException
+from utils.tool_call_parser import CODE_BLOCK_RE, JSON_CODE_RE, is_valid_tool_call_json, iter_json_candidates
 from .execution_engine import ExecutionEngine
 
 
@@ -93,31 +94,12 @@ class ToolExecutionSimulator(BaseModule):
         Returns:
             List of tool calls, each as a dict {'name': str, 'arguments': dict}
         """
-        import re
-        import json
-
-        def is_valid_tool_call_json(json_str: str) -> bool:
-            try:
-                parsed_json = json.loads(json_str)
-                if not isinstance(parsed_json, dict):
-                    return False
-                if 'name' not in parsed_json:
-                    return False
-                if not isinstance(parsed_json['name'], str) or not parsed_json['name'].strip():
-                    return False
-                if 'arguments' in parsed_json and not isinstance(parsed_json['arguments'], dict):
-                    return False
-                return True
-            except (json.JSONDecodeError, TypeError, KeyError):
-                return False
-
         try:
             tool_calls = []
             processed_json_strings = set()
 
             # 1. Extract ```json ... ``` code blocks
-            json_code_pattern = r'```json\s*(.*?)\s*```'
-            matches = re.findall(json_code_pattern, agent_message, re.DOTALL)
+            matches = JSON_CODE_RE.findall(agent_message)
             for match in matches:
                 json_content = match.strip()
                 if json_content in processed_json_strings:
@@ -135,8 +117,7 @@ class ToolExecutionSimulator(BaseModule):
                     continue
 
             # 2. Extract ``` ... ``` code blocks (no language specified)
-            code_block_pattern = r'```\s*(.*?)\s*```'
-            matches_code = re.findall(code_block_pattern, agent_message, re.DOTALL)
+            matches_code = CODE_BLOCK_RE.findall(agent_message)
             for match in matches_code:
                 code_content = match.strip()
                 if code_content in processed_json_strings:
@@ -162,38 +143,24 @@ class ToolExecutionSimulator(BaseModule):
                 code_block = f"```{match}```"
                 remaining_message = remaining_message.replace(code_block, " ")
 
-            # 4. Extract JSON objects {...}
-            json_object_pattern = r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}'
-            json_matches = re.finditer(json_object_pattern, remaining_message)
-            for match in json_matches:
-                json_str = match.group(0)
-                if json_str in processed_json_strings:
-                    continue
-                processed_json_strings.add(json_str)
-                if is_valid_tool_call_json(json_str):
-                    try:
-                        parsed_json = json.loads(json_str)
-                        tool_calls.append(parsed_json)
-                    except Exception:
-                        continue
-
-            # 5. Extract JSON arrays [...]
-            json_array_pattern = r'\[[^\[\]]*(?:\[[^\[\]]*\][^\[\]]*)*\]'
-            array_matches = re.finditer(json_array_pattern, remaining_message)
-            for match in array_matches:
-                json_str = match.group(0)
+            # 4. Extract JSON objects {...} (single linear brace-matching scan; a stray unclosed '{' does not hide later objects)
+            for json_str in iter_json_candidates(remaining_message, '{', accept=is_valid_tool_call_json):
                 if json_str in processed_json_strings:
                     continue
                 processed_json_strings.add(json_str)
                 try:
                     parsed_json = json.loads(json_str)
-                    if isinstance(parsed_json, list):
-                        for item in parsed_json:
-                            if isinstance(item, dict) and 'name' in item and is_valid_tool_call_json(json.dumps(item)):
-                                tool_calls.append(item)
+                    tool_calls.append(parsed_json)
                 except Exception:
                     continue
 
+            # 5. Extract JSON arrays [...] (same scan; each array is parsed once)
+            for json_str in iter_json_candidates(remaining_message, '['):
+                if json_str in processed_json_strings:
+                    continue
+                processed_json_strings.add(json_str)
+                tool_calls.extend(self._tool_calls_in_array(json_str))
+
             # 6. Try to parse the whole message (after removing code blocks) as JSON (single line, fallback)
             cleaned_content = re.sub(r'\s+', ' ', remaining_message.strip())
             if cleaned_content not in processed_json_strings and is_valid_tool_call_json(cleaned_content):
@@ -214,6 +181,20 @@ class ToolExecutionSimulator(BaseModule):
             self.logger.error(f"Failed to extract tool calls from message: {e}")
             return []
     
+    @staticmethod
+    def _tool_calls_in_array(json_str: str) -> List[Dict[str, Any]]:
+        """Parse a JSON array and return the items that are valid tool calls (empty if not an array)."""
+        try:
+            parsed_json = json.loads(json_str)
+        except Exception:
+            return []
+        if not isinstance(parsed_json, list):
+            return []
+        return [
+            item for item in parsed_json
+            if isinstance(item, dict) and 'name' in item and is_valid_tool_call_json(json.dumps(item))
+        ]
+
     def reset_execution_state(self):
         """重置执行状态"""
         if self.execution_engine:
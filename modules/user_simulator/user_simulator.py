@@ -4,7 +4,7 @@
 """
 
 import json
-from typing import Dict, Any
+from typing import Dict, Any, List, Union
 import logging
 
 from core.base_module import BaseModule
@@ -61,23 +61,37 @@ class UserSimulator(BaseModule):
         self.current_persona = user_persona
         self.logger.info(f"Initialized user simulator for task {task.id} with persona {user_persona.id}")
     
+    def _build_system_prompt(self):
+        """构建当前任务与人格对应的系统提示词内容块"""
+        personality = getattr(self.current_persona.personality_type, 'value', self.current_persona.personality_type)
+        style = getattr(self.current_persona.style_type, 'value', self.current_persona.style_type)
+        
+        # 已知人格/风格组合直接复用预渲染结果
+        if self.prompts.characteristics_for(personality, style) is not None:
+            return self.prompts.build_persona_simulation_system(
+                personality=personality,
+                style=style,
+                task_instruction=self.current_task.description
+            )
+        
+        # 构建用户特征描述
+        user_characteristics = self.prompts.user_characteristics(
+            personality_description=self.current_persona.metadata.get('personality_description', ''),
+            style_description=self.current_persona.metadata.get('style_description', '')
+        )
+        return self.prompts.build_user_simulation_system(
+            task_instruction=self.current_task.description,
+            user_characteristics=user_characteristics
+        )
+    
     def generate_initial_message(self) -> str:
         """生成初始用户消息"""
         try:
             if not self.current_task or not self.current_persona:
                 raise AgentDataGenException("No active task or persona for message generation")
             
-            # 构建用户特征描述
-            user_characteristics = self.prompts.USER_CHARACTERISTICS_TEMPLATE.format(
-                personality_description=self.current_persona.metadata.get('personality_description', ''),
-                style_description=self.current_persona.metadata.get('style_description', '')
-            )
-            
             # 构建系统提示词
-            system_prompt = self.prompts.USER_SIMULATION_SYSTEM.format(
-                user_characteristics=user_characteristics,
-                task_instruction=self.current_task.description
-            )
+            system_prompt = self._build_system_prompt()
             
             # 生成初始消息
             response = self.llm_client.generate_completion(
@@ -91,13 +105,13 @@ class UserSimulator(BaseModule):
             self.logger.error(f"Failed to generate initial message: {e}")
             return "你好，我需要一些帮助。"  # 回退到默认消息
     
-    def respond_to_agent(self, agent_message: str, conversation_history: str = "") -> str:
+    def respond_to_agent(self, agent_message: str, conversation_history: Union[str, List[str]] = "") -> str:
         """
         响应智能体的消息
         
         Args:
             agent_message: 智能体发送的消息
-            conversation_history: 对话历史
+            conversation_history: 对话历史（字符串，或逐条历史行以便按轮次缓存前缀）
             
         Returns:
             用户的响应消息
@@ -106,22 +120,16 @@ class UserSimulator(BaseModule):
             if not self.current_persona or not self.current_task:
                 raise AgentDataGenException("No active persona or task for response generation")
             
-            # 构建用户特征描述
-            user_characteristics = self.prompts.USER_CHARACTERISTICS_TEMPLATE.format(
-                personality_description=self.current_persona.metadata.get('personality_description', ''),
-                style_description=self.current_persona.metadata.get('style_description', '')
-            )
-            
             # 构建系统提示词
-            system_prompt = self.prompts.USER_SIMULATION_SYSTEM.format(
-                user_characteristics=user_characteristics,
-                task_instruction=self.current_task.description
-            )
+            system_prompt = self._build_system_prompt()
             
             # 构建用户提示词
-            user_prompt = self.prompts.USER_RESPONSE_PROMPT.format(
-                conversation_history=conversation_history
-            )
+            if isinstance(conversation_history, list):
+                user_prompt = self.prompts.build_turn(conversation_history)
+            else:
+                user_prompt = self.prompts.user_response(
+                    conversation_history=conversation_history
+                )
             
             # 生成响应
             response = self.llm_client.generate_completion(
@@ -98,16 +98,20 @@ class ScenarioFilter:
         
         print(f"Computing similarities for {n} strings...")
         
-        for i in range(n):
-            for j in range(i + 1, n):
-                similarity = self.cosine_similarity(embeddings[i], embeddings[j])
-                
-                if similarity > self.similarity_threshold:
-                    similar_pairs.append({
-                        'string1': strings_data[i],
-                        'string2': strings_data[j],
-                        'similarity': similarity,
-                    })
+        # 每个embedding只归一化一次，之后余弦相似度就是点积（零向量保持为零，相似度为0）
+        vectors = np.asarray(embeddings, dtype=np.float64)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        unit_vectors = vectors / np.where(norms == 0, 1.0, norms)
+        
+        for i in range(n - 1):
+            # 第 i 个字符串与其后所有字符串的相似度一次算出
+            similarities = unit_vectors[i + 1:] @ unit_vectors[i]
+            for offset in np.flatnonzero(similarities > self.similarity_threshold):
+                similar_pairs.append({
+                    'string1': strings_data[i],
+                    'string2': strings_data[i + 1 + offset],
+                    'similarity': float(similarities[offset]),
+                })
         
         print(f"Found {len(similar_pairs)} similar pairs (similarity > {self.similarity_threshold})")
         return similar_pairs
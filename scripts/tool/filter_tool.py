@@ -13,6 +13,8 @@ from datetime import datetime
 from typing import Dict, Any, List, Tuple
 from collections import defaultdict
 
+import numpy as np
+
 # 添加项目根目录到Python路径
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
@@ -175,6 +177,30 @@ def calculate_cosine_similarity(embedding1: List[float], embedding2: List[float]
         return 0.0
 
 
+def calculate_similarity_matrix(embeddings: List[List[float]]) -> np.ndarray:
+    """
+    一次矩阵乘法计算所有embedding两两之间的余弦相似度（与 calculate_cosine_similarity 结果一致）
+    维度不一致的embedding无法组成矩阵，此时逐对调用 calculate_cosine_similarity
+    """
+    try:
+        vectors = np.asarray(embeddings, dtype=np.float64)
+    except ValueError:
+        vectors = None
+    
+    if vectors is None or vectors.ndim != 2:
+        n = len(embeddings)
+        matrix = np.zeros((n, n))
+        for i in range(n):
+            for j in range(i + 1, n):
+                matrix[i, j] = matrix[j, i] = calculate_cosine_similarity(embeddings[i], embeddings[j])
+        return matrix
+    
+    # 每行归一化一次，余弦相似度即为点积（零向量相似度为0）
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors /= np.where(norms == 0, 1.0, norms)
+    return np.clip(vectors @ vectors.T, 0.0, 1.0)
+
+
 def group_tools_by_scenario(tools_data: List[Dict]) -> Dict[str, List[Dict]]:
     """将工具按场景分组"""
     scenario_groups = defaultdict(list)
@@ -215,31 +241,23 @@ def deduplicate_tools_in_scenario(tools_in_scenario: List[Dict],
         return tools_in_scenario, {'clusters': 0, 'removed': 0}
     
     # 计算相似度矩阵并聚类
+    similarity_matrix = calculate_similarity_matrix(
+        [tool['metadata']['embedding'] for tool in tools_with_embedding]
+    )
     clusters = []
-    used_indices = set()
+    used = np.zeros(len(tools_with_embedding), dtype=bool)
     
-    for i, tool1 in enumerate(tools_with_embedding):
-        if i in used_indices:
+    for i in range(len(tools_with_embedding)):
+        if used[i]:
             continue
         
-        # 创建新簇
-        cluster = [i]
-        embedding1 = tool1['metadata']['embedding']
-        
-        # 寻找相似的工具
-        for j, tool2 in enumerate(tools_with_embedding[i+1:], i+1):
-            if j in used_indices:
-                continue
-            
-            embedding2 = tool2['metadata']['embedding']
-            similarity = calculate_cosine_similarity(embedding1, embedding2)
-            
-            if similarity >= similarity_threshold:
-                cluster.append(j)
-                used_indices.add(j)
+        # 创建新簇：其后尚未归簇、且与当前工具足够相似的工具
+        similar = np.flatnonzero(similarity_matrix[i, i + 1:] >= similarity_threshold) + i + 1
+        similar = similar[~used[similar]]
         
-        clusters.append(cluster)
-        used_indices.add(i)
+        clusters.append([i, *similar.tolist()])
+        used[similar] = True
+        used[i] = True
     
     # 从每个簇中选择最佳工具
     selected_tools = []
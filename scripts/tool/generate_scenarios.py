@@ -6,6 +6,7 @@
 
 import sys
 import os
+import logging
 from pathlib import Path
 from typing import Dict, Any, List
 
@@ -53,7 +54,7 @@ def generate_scenarios_for_all_domains(logger):
     domains = scenario_config['domains']
     target_total = scenario_config['target_count']
     
-    logger.info(f"目标生成 {target_total} 个场景，覆盖 {len(domains)} 个领域")
+    logger.info("目标生成 %s 个场景，覆盖 %s 个领域", target_total, len(domains))
     
     try:
         # 初始化场景生成器
@@ -84,15 +85,19 @@ def generate_scenarios_for_all_domains(logger):
 
 def analyze_generation_results(scenarios: List[Dict[str, Any]], stats: Dict[str, Any], logger):
     """分析生成结果"""
+    # 摘要只用于日志输出，INFO 未开启时直接跳过统计与格式化
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    
     logger.info("\n" + "="*50)
     logger.info("场景生成结果分析")
     logger.info("="*50)
     
     # 基本统计
     total_scenarios = len(scenarios)
-    logger.info(f"📊 总体统计:")
-    logger.info(f"   生成场景总数: {total_scenarios}")
-    logger.info(f"   生成批次数: {stats.get('batch_files', 0)}")
+    logger.info("📊 总体统计:")
+    logger.info("   生成场景总数: %s", total_scenarios)
+    logger.info("   生成批次数: %s", stats.get('batch_files', 0))
     
     # 领域分布
     domain_distribution = {}
@@ -100,10 +105,10 @@ def analyze_generation_results(scenarios: List[Dict[str, Any]], stats: Dict[str,
         domain = scenario.get('domain', '未知')
         domain_distribution[domain] = domain_distribution.get(domain, 0) + 1
     
-    logger.info(f"\n🌐 领域分布:")
+    logger.info("\n🌐 领域分布:")
     for domain, count in sorted(domain_distribution.items(), key=lambda x: x[1], reverse=True):
         percentage = (count / total_scenarios) * 100 if total_scenarios > 0 else 0
-        logger.info(f"   {domain}: {count} 个场景 ({percentage:.1f}%)")
+        logger.info("   %s: %s 个场景 (%.1f%%)", domain, count, percentage)
     
     logger.info("\n" + "="*50)
 
@@ -128,8 +133,8 @@ def main():
         analyze_generation_results(scenarios, stats, logger)
         
         # 最终总结
-        logger.info(f"\n🎉 场景生成完成!")
-        logger.info(f"✅ 成功生成 {len(scenarios)} 个场景")
+        logger.info("\n🎉 场景生成完成!")
+        logger.info("✅ 成功生成 %s 个场景", len(scenarios))
 
         return 0
         
@@ -6,6 +6,7 @@
 
 import sys
 import os
+import logging
 from pathlib import Path
 from typing import Dict, Any, List
 import json
@@ -54,7 +55,7 @@ def validate_environment(logger):
     tools_path = settings.get_data_path('tools')
     if not tools_path.exists():
         tools_path.mkdir(parents=True, exist_ok=True)
-        logger.info(f"创建工具数据目录: {tools_path}")
+        logger.info("创建工具数据目录: %s", tools_path)
     
     logger.info("环境验证完成")
     return True
@@ -75,17 +76,17 @@ def load_existing_scenarios(logger):
         if all_scenario_files:
             # 使用最新的汇总文件
             latest_file = max(all_scenario_files, key=lambda f: f.stat().st_mtime)
-            logger.info(f"使用汇总场景文件: {latest_file.name}")
+            logger.info("使用汇总场景文件: %s", latest_file.name)
             scenarios = file_manager.load_json(latest_file.name)
         else:
             raise FileNotFoundError("未找到场景数据文件")
     else:
         # 使用最新的批次文件
         latest_file = max(scenario_files, key=lambda f: f.stat().st_mtime)
-        logger.info(f"使用场景批次文件: {latest_file.name}")
+        logger.info("使用场景批次文件: %s", latest_file.name)
         scenarios = file_manager.load_json(latest_file.name)
     
-    logger.info(f"成功加载 {len(scenarios)} 个场景")
+    logger.info("成功加载 %s 个场景", len(scenarios))
     return scenarios
 
 
@@ -146,22 +147,19 @@ def analyze_generation_results(scenarios: List[Dict[str, Any]], tools: List[Dict
     total_tools = len(tools)
     tools_per_scenario = total_tools / total_scenarios if total_scenarios > 0 else 0
     
-    # 按领域统计
+    # 按领域、元数据类别和工具类型统计（单次遍历）
     domain_stats = {}
     category_stats = {}
+    tool_types = {}
     
     for tool in tools:
         metadata = tool.get('metadata', {})
         domain = metadata.get('domain', 'unknown')
         category = metadata.get('category', 'unknown')
+        tool_type = tool.get('category', 'unknown')
         
         domain_stats[domain] = domain_stats.get(domain, 0) + 1
         category_stats[category] = category_stats.get(category, 0) + 1
-    
-    # 工具类型统计
-    tool_types = {}
-    for tool in tools:
-        tool_type = tool.get('category', 'unknown')
         tool_types[tool_type] = tool_types.get(tool_type, 0) + 1
     
     analysis = {
@@ -177,22 +175,23 @@ def analyze_generation_results(scenarios: List[Dict[str, Any]], tools: List[Dict
         'designer_stats': designer_stats
     }
     
-    # 输出结果摘要
-    logger.info("=" * 60)
-    logger.info("工具生成结果摘要")
-    logger.info("=" * 60)
-    logger.info(f"📊 总场景数: {total_scenarios}")
-    logger.info(f"🔧 总工具数: {total_tools}")
-    logger.info(f"📈 平均每场景工具数: {tools_per_scenario:.2f}")
-    logger.info(f"✅ 成功注册工具数: {registration_result.get('registered_count', 0)}")
-    
-    logger.info("\n📂 领域分布:")
-    for domain, count in sorted(domain_stats.items(), key=lambda x: x[1], reverse=True)[:10]:
-        logger.info(f"   {domain}: {count} 个工具")
-    
-    logger.info("\n🔨 工具类型分布:")
-    for tool_type, count in sorted(tool_types.items(), key=lambda x: x[1], reverse=True)[:10]:
-        logger.info(f"   {tool_type}: {count} 个工具")
+    # 输出结果摘要（INFO 未开启时跳过排序与格式化）
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("=" * 60)
+        logger.info("工具生成结果摘要")
+        logger.info("=" * 60)
+        logger.info("📊 总场景数: %s", total_scenarios)
+        logger.info("🔧 总工具数: %s", total_tools)
+        logger.info("📈 平均每场景工具数: %.2f", tools_per_scenario)
+        logger.info("✅ 成功注册工具数: %s", registration_result.get('registered_count', 0))
+        
+        logger.info("\n📂 领域分布:")
+        for domain, count in sorted(domain_stats.items(), key=lambda x: x[1], reverse=True)[:10]:
+            logger.info("   %s: %s 个工具", domain, count)
+        
+        logger.info("\n🔨 工具类型分布:")
+        for tool_type, count in sorted(tool_types.items(), key=lambda x: x[1], reverse=True)[:10]:
+            logger.info("   %s: %s 个工具", tool_type, count)
     
     return analysis
 
@@ -211,7 +210,7 @@ def save_consolidated_results(tools: List[Dict[str, Any]], analysis: Dict[str, A
         # 保存分析结果
         analysis_file = f"generation_analysis_{timestamp}.json"
         file_manager.save_json(analysis, analysis_file)
-        logger.info(f"保存分析结果: {analysis_file}")
+        logger.info("保存分析结果: %s", analysis_file)
         
         return {
             'analysis_file': str(tools_path / analysis_file),
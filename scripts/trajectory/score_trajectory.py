@@ -103,6 +103,18 @@ def load_trajectory_files(trajectories_dir: Path, logger: logging.Logger) -> Lis
     return trajectories_data
 
 
+def _turn_timestamp(value: Any) -> Optional[float]:
+    """将轮次时间统一为Unix时间戳（秒），兼容ISO字符串；无法识别时返回None"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            return None
+    return None
+
+
 def convert_dict_to_trajectory(trajectory_data: Dict[str, Any]) -> Optional[Trajectory]:
     """将轨迹字典转换为Trajectory对象"""
     try:
@@ -141,12 +153,16 @@ def convert_dict_to_trajectory(trajectory_data: Dict[str, Any]) -> Optional[Traj
                     message = turn_data.get('message', '')
                     recipient = turn_data.get('recipient', '')
                 
-                turn = ConversationTurn(
-                    speaker=speaker,
-                    recipient=recipient,
-                    message=message,
-                    timestamp=turn_data.get('timestamp')
-                )
+                turn_kwargs = {
+                    'speaker': speaker,
+                    'recipient': recipient,
+                    'message': message,
+                }
+                # 缺失时间戳时交给字段默认值，避免写入None
+                timestamp = _turn_timestamp(turn_data.get('timestamp'))
+                if timestamp is not None:
+                    turn_kwargs['timestamp'] = timestamp
+                turn = ConversationTurn(**turn_kwargs)
                 turns.append(turn)
         
         session = InteractionSession(
@@ -214,30 +230,38 @@ def prefilter_trajectories(
     return filtered_trajectories
 
 
-def score_single_trajectory(
+def score_trajectory_batch(
     logger: logging.Logger,
     evaluator: TrajectoryEvaluator,
-    trajectory: Trajectory
-) -> Optional[Dict[str, Any]]:
-    """评估单个轨迹"""
+    trajectories: List[Trajectory]
+) -> List[Dict[str, Any]]:
+    """批量评估一组轨迹（一次LLM调用），未得到评分的轨迹记为失败"""
     try:
-        # 执行评估
-        scored_trajectory = evaluator.evaluate_trajectory(trajectory)
-        
-        return {
-            'trajectory_id': trajectory.id,
-            'turns_count': len(trajectory.session.turns),
-            'score': scored_trajectory.evaluation_score.overall_score if scored_trajectory.evaluation_score else 0,
-            'status': 'success'
+        scored_ids = {
+            trajectory.id: trajectory.evaluation_score.overall_score if trajectory.evaluation_score else 0
+            for trajectory in evaluator.evaluate_trajectories(trajectories)
         }
-        
     except Exception as e:
-        logger.error(f"评估轨迹失败 - ID: {trajectory.id}, 错误: {e}")
-        return {
-            'trajectory_id': trajectory.id,
-            'status': 'failed',
-            'error': str(e)
-        }
+        logger.error(f"批量评估轨迹失败 - IDs: {[t.id for t in trajectories]}, 错误: {e}")
+        scored_ids = {}
+    
+    results = []
+    for trajectory in trajectories:
+        if trajectory.id in scored_ids:
+            results.append({
+                'trajectory_id': trajectory.id,
+                'turns_count': len(trajectory.session.turns),
+                'score': scored_ids[trajectory.id],
+                'status': 'success'
+            })
+        else:
+            results.append({
+                'trajectory_id': trajectory.id,
+                'status': 'failed',
+                'error': 'not scored'
+            })
+    return results
+
 
 def main():
     """主函数"""
@@ -312,38 +336,37 @@ def main():
         successful_count = 0
         failed_count = 0
         
-        # 使用多线程进行评分
+        # 使用多线程进行评分，每个任务批量评估 batch_size 条轨迹
+        batch_size = settings.QUALITY_CONFIG.get('batch_size', 5)
+        batches = [
+            filtered_trajectories[i:i + batch_size]
+            for i in range(0, len(filtered_trajectories), batch_size)
+        ]
+        processed = 0
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_trajectory = {}
-            
-            for trajectory in filtered_trajectories:
-                future = executor.submit(
-                    score_single_trajectory,
-                    logger,
-                    evaluator,
-                    trajectory
-                )
-                future_to_trajectory[future] = trajectory.id
+            futures = [
+                executor.submit(score_trajectory_batch, logger, evaluator, batch)
+                for batch in batches
+            ]
             
             # 收集评分结果
-            for i, future in enumerate(as_completed(future_to_trajectory), 1):
+            for future in as_completed(futures):
                 try:
-                    result = future.result()
-                    if result:
-                        scoring_results.append(result)
-                        
-                        if result['status'] == 'success':
-                            successful_count += 1
-                        else:
-                            failed_count += 1
-                        
-                        # 输出总进度
-                        if i % 10 == 0:
-                            print(f"📊 总进度: {i}/{len(filtered_trajectories)} ({i/len(filtered_trajectories)*100:.1f}%)")
-                            
+                    batch_results = future.result()
                 except Exception as e:
-                    failed_count += 1
                     logger.error(f"轨迹评分任务异常: {e}")
+                    continue
+                
+                scoring_results.extend(batch_results)
+                for result in batch_results:
+                    if result['status'] == 'success':
+                        successful_count += 1
+                    else:
+                        failed_count += 1
+                
+                # 输出总进度
+                processed += len(batch_results)
+                print(f"📊 总进度: {processed}/{len(filtered_trajectories)} ({processed/len(filtered_trajectories)*100:.1f}%)")
         
         print(f"✅ 评分完成: {successful_count} 个轨迹成功, {failed_count} 个轨迹失败")
         
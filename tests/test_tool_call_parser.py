@@ -0,0 +1,58 @@
+"""
+工具调用解析工具测试
+"""
+
+import time
+
+from utils.tool_call_parser import is_valid_tool_call_json, iter_json_candidates
+
+TOOL_CALL = '{"name": "get_weather", "arguments": {"city": "Beijing"}}'
+
+
+def _tool_calls(text: str, opener: str = '{'):
+    return list(iter_json_candidates(text, opener, accept=is_valid_tool_call_json))
+
+
+def test_nested_arguments_yield_outermost_object():
+    assert _tool_calls(f"调用工具：{TOOL_CALL} 完成") == [TOOL_CALL]
+    # arguments 中含 name 键时不能把内层对象当作工具调用
+    call = '{"name": "create_user", "arguments": {"name": "Bob"}}'
+    assert _tool_calls(call) == [call]
+
+
+def test_braces_inside_strings_are_ignored():
+    text = 'a {b} c {"x": "}{"} d {"y": "\\"}"}'
+    assert list(iter_json_candidates(text)) == ['{b}', '{"x": "}{"}', '{"y": "\\"}"}']
+
+
+def test_tool_call_after_stray_open_brace():
+    # 回归用例：正文中未闭合的 { 不能吞掉其后的工具调用
+    text = f'Sure :{{ let me check {TOOL_CALL}'
+    assert _tool_calls(text) == [TOOL_CALL]
+    text = f'{{ first {{ second {TOOL_CALL} and {TOOL_CALL}'
+    assert _tool_calls(text) == [TOOL_CALL, TOOL_CALL]
+
+
+def test_tool_call_array_after_stray_open_bracket():
+    array = f'[{TOOL_CALL}]'
+    assert list(iter_json_candidates(f'options [ a, b: {array}', '[')) == [array]
+
+
+def test_stray_closers_are_ignored():
+    assert list(iter_json_candidates('} ] {a} } {b')) == ['{a}']
+
+
+def test_malformed_large_inputs_scan_in_linear_time():
+    cases = [
+        '{ x ' * 50000,                                    # 大量未闭合的开括号
+        '{"a": ' * 20000 + '1' + '}' * 20000,              # 深层嵌套的非工具调用对象
+        '{"name": 1, "x": ' * 20000 + '1' + '}' * 20000,   # 每层都含 name 但结构不合格
+        '{ x ' * 50000 + TOOL_CALL,
+    ]
+    start = time.perf_counter()
+    results = [_tool_calls(text) for text in cases]
+    elapsed = time.perf_counter() - start
+
+    assert results == [[], [], [], [TOOL_CALL]]
+    # 平方复杂度的实现在这些输入上需要数十秒
+    assert elapsed < 2.0
@@ -1,16 +1,31 @@
 """
 工具类模块
 提供各种通用工具和辅助功能
+子模块在首次访问时才导入（PEP 562），避免只用日志/文件工具时也加载 openai 等重依赖
 """
 
-from .llm_client import LLMClient
-from .logger import setup_logger
-from .file_manager import FileManager
-from .data_processor import DataProcessor
+import importlib
 
-__all__ = [
-    'LLMClient',
-    'setup_logger', 
-    'FileManager',
-    'DataProcessor'
-] 
\ No newline at end of file
+_LAZY = {
+    'LLMClient': 'llm_client',
+    'setup_logger': 'logger',
+    'FileManager': 'file_manager',
+    'DataProcessor': 'data_processor',
+    'is_valid_tool_call_json': 'tool_call_parser',
+    'iter_json_candidates': 'tool_call_parser',
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module("." + _LAZY[name], __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
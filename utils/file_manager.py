@@ -6,12 +6,50 @@
 import json
 import pickle
 from pathlib import Path
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, Iterable, List, Optional, Union
 import logging
 from datetime import datetime
 
 from core.exceptions import DataStorageError
 
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时回退到标准库 json
+    orjson = None
+    _ORJSON_OPTIONS = 0
+else:
+    # numpy 标量/数组按数值输出；datetime 与 dataclass 交给 default=str，与标准库 json 的输出一致
+    _ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+                       | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS)
+
+
+def _dumps_json(data: Any, indent: Optional[int] = 2) -> bytes:
+    """
+    序列化为UTF-8编码的JSON（orjson 只支持缩进2或不缩进，其他缩进及 orjson 无法处理的数据使用标准库 json）
+    """
+    if orjson is not None and indent in (2, None):
+        option = _ORJSON_OPTIONS | orjson.OPT_INDENT_2 if indent else _ORJSON_OPTIONS
+        try:
+            return orjson.dumps(data, default=str, option=option)
+        except TypeError:  # orjson.JSONEncodeError，如超出64位的整数
+            pass
+    return json.dumps(data, ensure_ascii=False, indent=indent, default=str).encode('utf-8')
+
+
+def _loads_json(raw: bytes) -> Any:
+    """解析JSON（orjson 不接受的 NaN/Infinity 等标准库扩展写法回退到标准库 json）"""
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw)
+
+
+def _dumps_record(item: Any) -> bytes:
+    """序列化JSON数组中的单条记录（缩进2，与 save_json 的输出风格一致）"""
+    return _dumps_json(item, indent=2)
+
 
 class FileManager:
     """文件管理工具类"""
@@ -44,9 +82,8 @@ class FileManager:
             # 确保目录存在
             file_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # 保存文件
-            with file_path.open('w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=indent, default=str)
+            # 保存文件（整体序列化为字节后一次写入）
+            file_path.write_bytes(_dumps_json(data, indent))
             
             self.logger.debug(f"Saved JSON file: {file_path}")
             
@@ -54,6 +91,41 @@ class FileManager:
             self.logger.error(f"Failed to save JSON file {file_path}: {e}")
             raise DataStorageError(f"Failed to save JSON file: {e}")
     
+    def save_json_array(self, items: Iterable[Any], file_path: Union[str, Path]) -> int:
+        """
+        逐条流式写入JSON数组，不在内存中构建完整列表和完整的序列化结果
+        
+        Args:
+            items: 记录的可迭代对象（可以是生成器）
+            file_path: 文件路径
+            
+        Returns:
+            写入的记录数
+        """
+        try:
+            file_path = Path(file_path)
+            if not file_path.is_absolute():
+                file_path = self.base_dir / file_path
+            
+            # 确保目录存在
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            
+            count = 0
+            with file_path.open('wb') as f:
+                f.write(b'[')
+                for item in items:
+                    f.write(b',\n' if count else b'\n')
+                    f.write(_dumps_record(item))
+                    count += 1
+                f.write(b'\n]' if count else b']')
+            
+            self.logger.debug(f"Saved JSON array file: {file_path} ({count} records)")
+            return count
+            
+        except Exception as e:
+            self.logger.error(f"Failed to save JSON file {file_path}: {e}")
+            raise DataStorageError(f"Failed to save JSON file: {e}")
+    
     def load_json(self, file_path: Union[str, Path]) -> Any:
         """
         加载JSON文件
@@ -72,8 +144,7 @@ class FileManager:
             if not file_path.exists():
                 raise FileNotFoundError(f"File not found: {file_path}")
             
-            with file_path.open('r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _loads_json(file_path.read_bytes())
             
             self.logger.debug(f"Loaded JSON file: {file_path}")
             return data
@@ -82,6 +153,60 @@ class FileManager:
             self.logger.error(f"Failed to load JSON file {file_path}: {e}")
             raise DataStorageError(f"Failed to load JSON file: {e}")
     
+    def append_jsonl(self, record: Any, file_path: Union[str, Path]) -> None:
+        """
+        向JSON Lines文件追加一条记录（文件不存在时创建）
+        
+        Args:
+            record: 要追加的记录
+            file_path: 文件路径
+        """
+        try:
+            file_path = Path(file_path)
+            if not file_path.is_absolute():
+                file_path = self.base_dir / file_path
+            
+            # 确保目录存在
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            
+            with file_path.open('ab') as f:
+                f.write(_dumps_json(record, indent=None))
+                f.write(b'\n')
+            
+            self.logger.debug(f"Appended record to JSONL file: {file_path}")
+            
+        except Exception as e:
+            self.logger.error(f"Failed to append to JSONL file {file_path}: {e}")
+            raise DataStorageError(f"Failed to append to JSONL file: {e}")
+    
+    def load_jsonl(self, file_path: Union[str, Path]) -> List[Any]:
+        """
+        加载JSON Lines文件（跳过空行）
+        
+        Args:
+            file_path: 文件路径
+            
+        Returns:
+            记录列表
+        """
+        try:
+            file_path = Path(file_path)
+            if not file_path.is_absolute():
+                file_path = self.base_dir / file_path
+            
+            if not file_path.exists():
+                raise FileNotFoundError(f"File not found: {file_path}")
+            
+            with file_path.open('rb') as f:
+                records = [_loads_json(line) for line in f if line.strip()]
+            
+            self.logger.debug(f"Loaded JSONL file: {file_path} ({len(records)} records)")
+            return records
+            
+        except Exception as e:
+            self.logger.error(f"Failed to load JSONL file {file_path}: {e}")
+            raise DataStorageError(f"Failed to load JSONL file: {e}")
+    
     def save_pickle(self, data: Any, file_path: Union[str, Path]) -> None:
         """
         保存数据为pickle文件
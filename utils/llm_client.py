@@ -3,12 +3,13 @@ LLM API客户端
 统一的大语言模型调用接口
 """
 
+import asyncio
 import json
 import time
 import logging
 from typing import Dict, Any, List, Optional, Union
 from dataclasses import dataclass
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 from core.exceptions import LLMApiError, ConfigurationError
 
@@ -63,11 +64,15 @@ class LLMClient:
             
         self.openai_client = OpenAI(**client_kwargs)
         self.openai_config = self.config
+        # 异步客户端在首次调用 agenerate_completion 时创建，其连接绑定于创建时的事件循环
+        self._openai_client_kwargs = client_kwargs
+        self._async_openai_client = None
+        self._async_client_loop = None
     
     def generate_completion(
         self,
-        prompt: str,
-        system_prompt: str = None,
+        prompt: Union[str, List[Dict[str, Any]]],
+        system_prompt: Union[str, List[Dict[str, Any]]] = None,
         model: str = None,
         temperature: float = None,
         max_tokens: int = None,
@@ -77,8 +82,8 @@ class LLMClient:
         生成文本补全
         
         Args:
-            prompt: 用户提示词
-            system_prompt: 系统提示词
+            prompt: 用户提示词（字符串或内容块列表）
+            system_prompt: 系统提示词（字符串或内容块列表）
             model: 模型名称
             temperature: 温度参数
             max_tokens: 最大令牌数
@@ -97,51 +102,95 @@ class LLMClient:
             else:
                 raise LLMApiError(f"Unsupported provider: {self.provider}")
             
-            response_time = time.time() - start_time
+            return self._wrap_response(response, start_time)
             
-            # 包装响应
-            llm_response = LLMResponse(
-                content=response.get("content", ""),
-                model=response.get("model", ""),
-                usage=response.get("usage", {}),
-                response_time=response_time,
-                metadata=response.get("metadata", {})
-            )
+        except Exception as e:
+            self.logger.error(f"LLM completion failed: {e}")
+            raise LLMApiError(f"LLM API call failed: {e}")
+    
+    async def agenerate_completion(
+        self,
+        prompt: Union[str, List[Dict[str, Any]]],
+        system_prompt: Union[str, List[Dict[str, Any]]] = None,
+        model: str = None,
+        temperature: float = None,
+        max_tokens: int = None,
+        **kwargs
+    ) -> LLMResponse:
+        """
+        异步生成文本补全（参数与 generate_completion 相同），便于用 asyncio.gather 并发多个请求
+        """
+        start_time = time.time()
+        
+        try:
+            if self.provider == "openai":
+                response = await self._aopenai_completion(
+                    prompt, system_prompt, model, temperature, max_tokens, **kwargs
+                )
+            else:
+                raise LLMApiError(f"Unsupported provider: {self.provider}")
             
-            self.logger.debug(f"LLM completion generated in {response_time:.2f}s")
-            return llm_response
+            return self._wrap_response(response, start_time)
             
         except Exception as e:
             self.logger.error(f"LLM completion failed: {e}")
             raise LLMApiError(f"LLM API call failed: {e}")
     
-    def _openai_completion(
+    def _wrap_response(self, response: Dict[str, Any], start_time: float) -> LLMResponse:
+        """将提供商响应包装为 LLMResponse"""
+        response_time = time.time() - start_time
+        
+        llm_response = LLMResponse(
+            content=response.get("content", ""),
+            model=response.get("model", ""),
+            usage=response.get("usage", {}),
+            response_time=response_time,
+            metadata=response.get("metadata", {})
+        )
+        
+        self.logger.debug(f"LLM completion generated in {response_time:.2f}s")
+        return llm_response
+    
+    @staticmethod
+    def _content_to_text(content: Union[str, List[Dict[str, Any]], None]) -> Optional[str]:
+        """将内容块列表拼接为纯文本；OpenAI按稳定前缀自动缓存，无需cache_control标记"""
+        if content is None or isinstance(content, str):
+            return content
+        return "".join(block.get("text", "") for block in content)
+    
+    def _openai_request(
         self,
-        prompt: str,
-        system_prompt: str = None,
+        prompt: Union[str, List[Dict[str, Any]]],
+        system_prompt: Union[str, List[Dict[str, Any]]] = None,
         model: str = None,
         temperature: float = None,
         max_tokens: int = None,
         **kwargs
     ) -> Dict[str, Any]:
-        """OpenAI API调用"""
+        """构建 OpenAI chat.completions.create 的请求参数"""
         model = model or self.openai_config.get("model", "gpt-4")
         temperature = temperature or self.openai_config.get("temperature", 0.7)
         max_tokens = max_tokens or self.openai_config.get("max_tokens", 2000)
         
+        system_prompt = self._content_to_text(system_prompt)
+        prompt = self._content_to_text(prompt)
+        
         messages = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
         
-        response = self.openai_client.chat.completions.create(
+        return dict(
             model=model,
             messages=messages,
             temperature=temperature,
             max_tokens=max_tokens,
             **kwargs
         )
-        
+    
+    @staticmethod
+    def _openai_result(response) -> Dict[str, Any]:
+        """提取 OpenAI 响应中的内容、用量和元数据"""
         return {
             "content": response.choices[0].message.content,
             "model": response.model,
@@ -152,6 +201,47 @@ class LLMClient:
             } if response.usage else {},
             "metadata": {"finish_reason": response.choices[0].finish_reason}
         }
+    
+    def _openai_completion(
+        self,
+        prompt: Union[str, List[Dict[str, Any]]],
+        system_prompt: Union[str, List[Dict[str, Any]]] = None,
+        model: str = None,
+        temperature: float = None,
+        max_tokens: int = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """OpenAI API调用"""
+        request = self._openai_request(prompt, system_prompt, model, temperature, max_tokens, **kwargs)
+        response = self.openai_client.chat.completions.create(**request)
+        return self._openai_result(response)
+    
+    async def _aopenai_completion(
+        self,
+        prompt: Union[str, List[Dict[str, Any]]],
+        system_prompt: Union[str, List[Dict[str, Any]]] = None,
+        model: str = None,
+        temperature: float = None,
+        max_tokens: int = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """OpenAI API异步调用"""
+        # 每次 asyncio.run 都是新的事件循环，旧循环上的连接不可复用，需要重新创建客户端
+        loop = asyncio.get_running_loop()
+        if self._async_openai_client is None or self._async_client_loop is not loop:
+            self._async_openai_client = AsyncOpenAI(**self._openai_client_kwargs)
+            self._async_client_loop = loop
+        request = self._openai_request(prompt, system_prompt, model, temperature, max_tokens, **kwargs)
+        response = await self._async_openai_client.chat.completions.create(**request)
+        return self._openai_result(response)
+
+    async def aclose(self):
+        """关闭异步客户端的连接池（在创建它的事件循环结束前调用），下次异步调用时重新创建"""
+        client = self._async_openai_client
+        self._async_openai_client = None
+        self._async_client_loop = None
+        if client is not None:
+            await client.close()
 
     def batch_generate(
         self,
@@ -0,0 +1,147 @@
+"""
+工具调用解析工具
+智能体模拟器与工具执行模拟器共用的工具调用识别逻辑（正则、JSON候选扫描、格式校验）
+"""
+
+import functools
+import json
+import re
+from typing import Callable, Iterator, Optional
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # 未安装 orjson 时回退到标准库 json
+    _json_loads = json.loads
+
+# 工具调用识别所用的正则（模块加载时编译一次）
+JSON_CODE_RE = re.compile(r'```json\s*(.*?)\s*```', re.DOTALL)
+CODE_BLOCK_RE = re.compile(r'```\s*(.*?)\s*```', re.DOTALL)
+# ```json ... ``` 与 ``` ... ``` 合并为一个模式，内容中不含语言标记
+FENCED_BLOCK_RE = re.compile(r'```(?:json)?\s*(.*?)\s*```', re.DOTALL)
+# 工具调用的结构约束：name 为非空字符串，arguments（可选）为对象
+TOOL_CALL_SCHEMA = {
+    'type': 'object',
+    'required': ['name'],
+    'properties': {
+        'name': {'type': 'string', 'pattern': r'\S'},
+        'arguments': {'type': 'object'},
+    },
+}
+
+
+def _check_tool_call_shape_manual(parsed_json) -> bool:
+    """手写的结构检查（未安装 fastjsonschema 时使用）"""
+    # 检查是否为字典类型
+    if not isinstance(parsed_json, dict):
+        return False
+
+    # 检查name字段是否存在、为字符串且不为空
+    name = parsed_json.get('name')
+    if not isinstance(name, str) or not name.strip():
+        return False
+
+    # 检查arguments字段（如果存在）
+    if 'arguments' in parsed_json and not isinstance(parsed_json['arguments'], dict):
+        return False
+
+    return True
+
+
+try:
+    import fastjsonschema
+except ImportError:  # 未安装 fastjsonschema 时使用手写检查
+    _check_tool_call_shape = _check_tool_call_shape_manual
+else:
+    _TOOL_CALL_VALIDATOR = fastjsonschema.compile(TOOL_CALL_SCHEMA)
+
+    def _check_tool_call_shape(parsed_json) -> bool:
+        """使用预编译的 fastjsonschema 校验器检查结构"""
+        try:
+            _TOOL_CALL_VALIDATOR(parsed_json)
+        except fastjsonschema.JsonSchemaException:
+            return False
+        return True
+
+
+# JSON扫描只关心的字符：对应的括号、双引号、反斜杠
+_JSON_TOKEN_RES = {
+    '{': (re.compile(r'[{}"\\]'), '}'),
+    '[': (re.compile(r'[\[\]"\\]'), ']'),
+}
+
+
+def iter_json_candidates(text: str, opener: str = '{',
+                         accept: Optional[Callable[[str], bool]] = None) -> Iterator[str]:
+    """
+    单遍扫描文本，按出现顺序产出最外层括号配对的子串（支持任意嵌套，无回溯，最坏情况线性时间）
+    字符串字面量中的括号和转义字符不计入配对
+
+    开括号用栈记录：直到文本末尾都未闭合的开括号（如正文中的孤立 "{"）不会吞掉其后的JSON，
+    其内部配对成功的最外层子串照常产出；未通过 accept 的子串直接跳过，不再扫描其内部
+
+    Args:
+        text: 待扫描文本
+        opener: '{' 提取JSON对象，'[' 提取JSON数组
+        accept: 候选子串的校验函数，为空时产出所有配对的子串
+    """
+    token_re, closer = _JSON_TOKEN_RES[opener]
+    # 栈中每项为 [开括号下标, 该开括号内已配对的最外层子串区间列表]
+    # 外层开括号闭合时，内部区间被外层子串取代；外层始终未闭合时，内部区间在扫描结束后产出
+    stack = []
+    in_string = False
+    escaped_pos = -1
+    for match in token_re.finditer(text):
+        pos = match.start()
+        if pos == escaped_pos:
+            continue
+        ch = text[pos]
+        if in_string:
+            if ch == '\\':
+                escaped_pos = pos + 1
+            elif ch == '"':
+                in_string = False
+        elif ch == opener:
+            stack.append([pos, []])
+        elif ch == closer:
+            if not stack:
+                continue
+            start, _ = stack.pop()
+            if stack:
+                stack[-1][1].append((start, pos + 1))
+                continue
+            candidate = text[start:pos + 1]
+            if accept is None or accept(candidate):
+                yield candidate
+        elif ch == '"' and stack:
+            in_string = True
+
+    # 未闭合的开括号（自外向内）中配对成功的子串，按出现顺序产出
+    for _, spans in stack:
+        for start, end in spans:
+            candidate = text[start:end]
+            if accept is None or accept(candidate):
+                yield candidate
+
+
+@functools.lru_cache(maxsize=2048)
+def is_valid_tool_call_json(json_str: str) -> bool:
+    """
+    验证JSON字符串是否为有效的工具调用格式
+    纯函数，按文本缓存结果（同一响应的多个分支常会提取出相同的候选串）
+
+    Args:
+        json_str: JSON字符串
+
+    Returns:
+        是否为有效的工具调用
+    """
+    # 结构预检：工具调用必须是含 "name" 键的JSON对象，不满足时无需调用JSON解析器
+    stripped = json_str.strip()
+    if not (stripped.startswith('{') and stripped.endswith('}') and '"name"' in stripped):
+        return False
+
+    try:
+        parsed_json = _json_loads(stripped)
+    except ValueError:  # json / orjson 的 JSONDecodeError 均为 ValueError 子类
+        return False
+    return _check_tool_call_shape(parsed_json)